@@ -1,5 +1,5 @@
 import asyncio
-from typing import Annotated, List, Optional
+from typing import Annotated, Any, Coroutine, List, NamedTuple, Optional, TypeVar
 
 import typer
 from rich.console import Console
@@ -8,12 +8,80 @@ from rich.panel import Panel
 from rich.table import Table
 
 from app.models.schemas import IssueMetadata
-from app.services.extractor import ExtractorService
-from app.services.triage import TriageService
+from app.services.registry import get_extractor, get_github_service, get_triage
 
 app = typer.Typer(help="GitHub Issue Triage Automation CLI")
 console = Console()
 
+T = TypeVar("T")
+
+try:  # optional: `pip install issueops[fast]`
+    import uvloop
+
+    _loop_factory = uvloop.new_event_loop
+except ImportError:
+    _loop_factory = None
+
+
+def _run_async(main: Coroutine[Any, Any, T]) -> T:
+    """
+    asyncio.run(), on a uvloop event loop when uvloop is installed. The shared
+    GitHub HTTP client is bound to this loop, so it is closed here before the
+    loop goes away, whichever command ran. Cache databases are closed too,
+    which folds their WAL back into the main file.
+    """
+    from app.services.cache import CacheManager
+
+    with asyncio.Runner(loop_factory=_loop_factory) as runner:
+        try:
+            return runner.run(main)
+        finally:
+            runner.run(get_github_service().aclose())
+            CacheManager.close_all()
+            # The cached extractor's CacheManager is closed now; build a fresh one next time.
+            get_extractor.cache_clear()
+
+
+class RepoRef(NamedTuple):
+    """An 'owner/repo' argument, split once while the CLI parses arguments."""
+    owner: str
+    name: str
+
+    def __str__(self) -> str:
+        return f"{self.owner}/{self.name}"
+
+
+def _parse_repo(value: str) -> RepoRef:
+    owner, _, name = value.partition("/")
+    if not owner or not name or "/" in name:
+        raise typer.BadParameter("Repo must be 'owner/repo'")
+    return RepoRef(owner, name)
+
+
+RepoArg = Annotated[
+    RepoRef,
+    typer.Argument(parser=_parse_repo, metavar="OWNER/REPO", help="Repository in format 'owner/repo'"),
+]
+
+
+def _emit_table(headers: List[str], rows: List[List[str]], **table_kwargs) -> None:
+    """
+    Render rows as a Rich table on a terminal. When output is captured (CI logs,
+    pipes) print tab-separated lines instead and skip Rich's layout pass.
+    """
+    if not console.is_terminal:
+        print("\t".join(headers))
+        for row in rows:
+            print("\t".join(row))
+        return
+
+    table = Table(**table_kwargs)
+    for header in headers:
+        table.add_column(header)
+    for row in rows:
+        table.add_row(*row)
+    console.print(table)
+
 @app.command()
 def init(
     force: bool = typer.Option(False, "--force", "-f", help="Overwrite existing configuration"),
@@ -67,17 +135,17 @@ def test(
             console.print("[red]No rules found. Run `issueops init` first.[/red]")
             raise typer.Exit(1)
 
-    triage = TriageService(rules)
+    triage = get_triage(rules)
     console.print(f"[bold blue]Testing Rules from {rules}[/bold blue]")
 
     # Build Metadata
     if body:
         # Mode A: End-to-End
         with console.status("Running LLM Extraction..."):
-            extractor = ExtractorService()
+            extractor = get_extractor()
             try:
                 # Mock minimal context for extract
-                metadata = asyncio.run(extractor.extract(body))
+                metadata = _run_async(extractor.extract(body))
                 console.print("[dim]LLM Extraction Complete[/dim]")
             except Exception as e:
                  console.print(f"[red]Extraction Failed: {e}[/red]")
@@ -129,9 +197,13 @@ def test(
             console.print(f"[dim][SKIP]  Rule '{res.rule_name}' (Condition failed)[/dim]")
 
 @app.command()
-def extract(file: str = typer.Argument(..., help="Path to text file containing the issue body")):
+def extract(
+    file: str = typer.Argument(..., help="Path to text file containing the issue body"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Always call the LLM instead of reusing a cached result"),
+):
     """
     Debug Mode: Run ONLY the Extractor Service on a file.
+    Repeat runs on an unchanged file are served from the local cache.
     """
     if not file:
         console.print("[red]Error: file path required[/red]")
@@ -139,7 +211,12 @@ def extract(file: str = typer.Argument(..., help="Path to text file containing t
 
     with console.status("Initialising LLM..."):
         try:
-            extractor = ExtractorService()
+            if no_cache:
+                from app.services.extractor import ExtractorService
+
+                extractor = ExtractorService(use_cache=False)
+            else:
+                extractor = get_extractor()
         except ValueError as e:
             console.print(f"[red]Setup Error: {e}[/red]")
             raise typer.Exit(code=1)
@@ -154,7 +231,7 @@ def extract(file: str = typer.Argument(..., help="Path to text file containing t
     console.print(f"[bold blue]Extracting metadata from {len(text)} chars...[/bold blue]")
 
     try:
-        metadata = asyncio.run(extractor.extract(text))
+        metadata = _run_async(extractor.extract(text))
     except Exception as e:
         console.print(f"[red]Extraction Failed: {e}[/red]")
         raise typer.Exit(code=1)
@@ -172,8 +249,8 @@ def decide(
     """
     with console.status("Initialising Services..."):
         try:
-            extractor = ExtractorService()
-            triage = TriageService(rules)
+            extractor = get_extractor()
+            triage = get_triage(rules)
         except ValueError as e:
             console.print(f"[red]Setup Error: {e}[/red]")
             raise typer.Exit(code=1)
@@ -187,7 +264,7 @@ def decide(
 
     console.print("[bold blue]Step 1: Extractor[/bold blue]")
     try:
-        metadata = asyncio.run(extractor.extract(text))
+        metadata = _run_async(extractor.extract(text))
     except Exception as e:
         console.print(f"[red]Extraction Failed: {e}[/red]")
         raise typer.Exit(code=1)
@@ -197,20 +274,20 @@ def decide(
     console.print("[bold blue]Step 2: Rules Engine[/bold blue]")
     action = triage.evaluate(metadata)
 
-    table = Table(title="Triage Decision")
-    table.add_column("Field", style="cyan")
-    table.add_column("Value", style="magenta")
-
-    table.add_row("Priority", str(action.priority_score))
-    table.add_row("Labels", ", ".join(action.labels))
-    table.add_row("Reasoning", action.reasoning)
-
-    console.print(table)
+    _emit_table(
+        ["Field", "Value"],
+        [
+            ["Priority", str(action.priority_score)],
+            ["Labels", ", ".join(action.labels)],
+            ["Reasoning", action.reasoning],
+        ],
+        title="Triage Decision",
+    )
 
 
 @app.command()
 def scan(
-    repo: Annotated[str, typer.Argument(help="Repository in format 'owner/repo'")],
+    repo: RepoArg,
     issue: Annotated[int, typer.Argument(help="Issue ID to triage")],
     role: Annotated[str, typer.Option(help="Filter by persona: 'maintainer' (P4-P5), 'contributor' (P1-P2), or 'all'")] = "all",
     rules: Annotated[str, typer.Option(help="Path to rules configuration")] = "rules.yaml",
@@ -220,114 +297,123 @@ def scan(
     """
     Universal Interface: Scan an issue and filter by persona (Maintainer vs Contributor).
     """
-    from app.core.config import settings
-    from app.services.github_service import GitHubService
 
     # 1. Setup
     with console.status("Initialising..."):
         try:
-            gh = GitHubService(github_token=settings.GITHUB_TOKEN)
-            extractor = ExtractorService()
-            triage = TriageService(rules)
+            gh = get_github_service()
+            extractor = get_extractor()
+            triage = get_triage(rules)
         except Exception as e:
             console.print(f"[red]Setup Error: {e}[/red]")
             raise typer.Exit(code=1)
 
-        if "/" not in repo:
-             console.print("[red]Repo must be 'owner/repo'[/red]")
-             raise typer.Exit(code=1)
-        owner, repo_name = repo.split("/")
-
-    # 2. Fetch
-    try:
-        with console.status(f"Fetching issue {repo}#{issue}..."):
-            gh_issue = asyncio.run(gh.fetch_issue(owner, repo_name, issue))
-    except Exception as e:
-        console.print(f"[red]Fetch Failed: {e}[/red]")
-        raise typer.Exit(code=1)
-
-    # 3. Extract
-    text_content = f"Title: {gh_issue.title}\n\nBody:\n{gh_issue.body}\n\nComments:\n" + "\n".join(gh_issue.comments)
-
-    with console.status("Analysing..."):
-        metadata = asyncio.run(extractor.extract(text_content))
-
-    # 4. Decide
-    action = triage.evaluate(metadata)
-    priority = action.priority_score
-
-    # 5. Filter Logic
-    visible = True
-    if role == "maintainer" and priority < 4:
-        visible = False
-        console.print(f"[dim]Skipping Issue #{issue} (Priority {priority}): Not a Maintainer target (P4+)[/dim]")
-    elif role == "contributor" and priority > 2:
-        visible = False
-        console.print(f"[dim]Skipping Issue #{issue} (Priority {priority}): Not a Contributor target (P1-P2)[/dim]")
-
-    if not visible:
-        raise typer.Exit(0)
+    owner, repo_name = repo
 
-    # 6. Report
-    console.print(Panel(f"Analysis for {repo}#{issue} ({role.upper()} View)", style="bold green"))
-
-    table = Table(show_header=True, header_style="bold magenta")
-    table.add_column("Metric")
-    table.add_column("Result")
-
-    table.add_row("Summary", metadata.summary)
-    table.add_row("Difficulty", metadata.difficulty)
-    table.add_row("Skills", ", ".join(metadata.required_skills))
-    table.add_row("Priority", str(priority))
-    table.add_row("Labels", ", ".join(action.labels))
-
-    console.print(table)
-    console.print(f"[italic]{action.reasoning}[/italic]")
+    async def _run() -> None:
+        # 2. Fetch
+        try:
+            with console.status(f"Fetching issue {repo}#{issue}..."):
+                gh_issue = await gh.fetch_issue(owner, repo_name, issue)
+        except Exception as e:
+            console.print(f"[red]Fetch Failed: {e}[/red]")
+            raise typer.Exit(code=1)
 
-    # 7. Apply
-    if apply:
-        if not yes:
-            confirm = typer.confirm("Do you want to apply these changes to GitHub?")
-            if not confirm:
-                console.print("[yellow]Aborted.[/yellow]")
-                raise typer.Exit()
+        # 3. Extract
+        text_parts = [
+            f"Title: {gh_issue.title}\n",
+            f"Body:\n{gh_issue.body or ''}\n",
+            "Comments:",
+            *gh_issue.comments,
+        ]
 
-        with console.status("Applying to GitHub..."):
-            success = asyncio.run(gh.apply_labels(owner, repo_name, issue, action.labels))
+        with console.status("Analysing..."):
+            metadata = extractor.fast_path(gh_issue.title, gh_issue.body or "") or await extractor.extract(text_parts)
+
+        # 4. Decide
+        action = triage.evaluate(metadata)
+        priority = action.priority_score
+
+        # 5. Filter Logic
+        visible = True
+        if role == "maintainer" and priority < 4:
+            visible = False
+            console.print(f"[dim]Skipping Issue #{issue} (Priority {priority}): Not a Maintainer target (P4+)[/dim]")
+        elif role == "contributor" and priority > 2:
+            visible = False
+            console.print(f"[dim]Skipping Issue #{issue} (Priority {priority}): Not a Contributor target (P1-P2)[/dim]")
+
+        if not visible:
+            raise typer.Exit(0)
+
+        # 6. Report
+        console.print(Panel(f"Analysis for {repo}#{issue} ({role.upper()} View)", style="bold green"))
+
+        _emit_table(
+            ["Metric", "Result"],
+            [
+                ["Summary", metadata.summary],
+                ["Difficulty", metadata.difficulty],
+                ["Skills", ", ".join(metadata.required_skills)],
+                ["Priority", str(priority)],
+                ["Labels", ", ".join(action.labels)],
+            ],
+            show_header=True,
+            header_style="bold magenta",
+        )
+        console.print(f"[italic]{action.reasoning}[/italic]")
+
+        # 7. Apply
+        if apply:
+            if not yes:
+                confirm = typer.confirm("Do you want to apply these changes to GitHub?")
+                if not confirm:
+                    console.print("[yellow]Aborted.[/yellow]")
+                    raise typer.Exit()
+
+            with console.status("Applying to GitHub..."):
+                success = await gh.apply_labels(owner, repo_name, issue, action.labels)
+
+                if success:
+                    console.print("[bold green]✔ Labels applied![/bold green]")
+                else:
+                    console.print("[bold red]✘ Failed to apply changes.[/bold red]")
+        else:
+            console.print("\n[dim]Dry run complete. Use --apply to execute changes.[/dim]")
 
-            if success:
-                console.print("[bold green]✔ Labels applied![/bold green]")
-            else:
-                console.print("[bold red]✘ Failed to apply changes.[/bold red]")
-    else:
-        console.print("\n[dim]Dry run complete. Use --apply to execute changes.[/dim]")
+    # One event loop for fetch → extract → apply, so the HTTP connection to
+    # api.github.com is reused instead of re-handshaking per stage.
+    _run_async(_run())
 
 @app.command()
 def report(
-    repo: Annotated[str, typer.Argument(help="Repository 'owner/repo'")],
+    repo: RepoArg,
     limit: int = typer.Option(5, help="Number of issues to scan"),
-    delay: float = typer.Option(0.0, help="Delay (in seconds) between requests to avoid Rate Limiting")
+    delay: float = typer.Option(0.0, help="Delay (in seconds) between requests to avoid Rate Limiting"),
+    batch_size: int = typer.Option(5, min=1, help="Issues sent to the LLM per request (ignored with --delay)"),
+    gzip_output: bool = typer.Option(False, "--gzip", help="Also write pre-compressed .gz copies of the board and feed"),
+    batch_job: bool = typer.Option(
+        False, "--batch-job", help="Extract through the Gemini Batch API (discounted, but may take minutes)"
+    ),
+    batch_timeout: float = typer.Option(
+        3600.0, "--batch-timeout", min=1, help="Seconds to wait for --batch-job before cancelling it"
+    ),
 ):
     """
     Generate the 'Contributor Job Board' (Static HTML).
     Scans recent issues and creates a filtered report.
     """
-    from app.core.config import settings
-    from app.services.github_service import GitHubService
     from app.services.reporter import BoardItem, Reporter
 
     # Wrap everything in a single async function
+    owner, repo_name = repo
+
     async def run_batch():
         # 1. Fetch
         with console.status(f"Fetching last {limit} issues from {repo}..."):
-            gh = GitHubService(github_token=settings.GITHUB_TOKEN)
-            extractor = ExtractorService()
-            triage = TriageService("rules.yaml")
-
-            if "/" not in repo:
-                 console.print("[red]Repo must be 'owner/repo'[/red]")
-                 raise typer.Exit(code=1)
-            owner, repo_name = repo.split("/")
+            gh = get_github_service()
+            extractor = get_extractor()
+            triage = get_triage("rules.yaml")
 
             try:
                 issues = await gh.fetch_issues(owner, repo_name, limit=limit)
@@ -339,27 +425,72 @@ def report(
 
         # 2. Analyze
         async def analyze_issue(issue):
-            text = f"{issue.title}\n{issue.body}"
             try:
-                meta = await extractor.extract(text)
+                meta = extractor.fast_path(issue.title, issue.body or "") or await extractor.extract(
+                    (issue.title, issue.body or "")
+                )
                 action = triage.evaluate(meta)
                 return (issue, meta, action)
             except Exception:
                 return None
 
-        with console.status(f"Batch Analysing (AI)... Delay: {delay}s"):
-            if delay > 0:
+        async def analyze_chunk(chunk):
+            try:
+                metas = await extractor.extract_batch([(i.title, i.body or "") for i in chunk])
+            except Exception:
+                return [None] * len(chunk)
+            # extract_batch is aligned with its input; a None means that issue failed.
+            extracted = [(issue, meta) for issue, meta in zip(chunk, metas) if meta]
+            actions = triage.evaluate_batch([meta for _, meta in extracted])
+            triaged = {
+                issue.number: (issue, meta, action) for (issue, meta), action in zip(extracted, actions)
+            }
+            return [triaged.get(issue.number) for issue in chunk]
+
+        async def analyze_batched(batch):
+            # Fast-path issues skip the LLM; the rest share one prompt per chunk.
+            done, pending = {}, []
+            for issue in batch:
+                meta = extractor.fast_path(issue.title, issue.body or "")
+                if meta:
+                    done[issue.number] = (issue, meta, triage.evaluate(meta))
+                else:
+                    pending.append(issue)
+            chunks = [pending[k:k + batch_size] for k in range(0, len(pending), batch_size)]
+            for chunk, chunk_results in zip(chunks, await asyncio.gather(*(analyze_chunk(c) for c in chunks))):
+                done.update((issue.number, res) for issue, res in zip(chunk, chunk_results))
+            # Keep the board in fetch order.
+            return [done.get(issue.number) for issue in batch]
+
+        async def analyze_offline(batch, on_poll):
+            # Fast-path issues skip the LLM; the rest go into one Batch API job.
+            metas = {i.number: extractor.fast_path(i.title, i.body or "") for i in batch}
+            pending = [i for i in batch if metas[i.number] is None]
+            offline = await extractor.extract_offline(
+                [(i.title, i.body or "") for i in pending], timeout=batch_timeout, on_poll=on_poll
+            )
+            metas.update((i.number, meta) for i, meta in zip(pending, offline))
+            return [(i, m, triage.evaluate(m)) if (m := metas.get(i.number)) else None for i in batch]
+
+        with console.status(f"Batch Analysing (AI)... Delay: {delay}s") as status:
+            if batch_job:
+                try:
+                    results = await analyze_offline(issues, status.update)
+                except Exception as e:
+                    # extract_offline has already cancelled the remote job.
+                    console.print(f"[yellow]Batch job failed ({e}); analysing directly.[/yellow]")
+                    results = await analyze_batched(issues)
+            elif delay > 0:
                 results = []
                 for i in issues:
                     res = await analyze_issue(i)
                     results.append(res)
                     await asyncio.sleep(delay)
             else:
-                tasks = [analyze_issue(i) for i in issues]
-                if not tasks:
+                if not issues:
                     console.print("[yellow]No issues to analyze.[/yellow]")
                     return
-                results = await asyncio.gather(*tasks)
+                results = await analyze_batched(issues)
 
         # 3. Filter & Assemble
         board_items = []
@@ -386,17 +517,17 @@ def report(
         reporter = Reporter()
         site_url = f"https://github.com/{owner}/{repo_name}"
 
-        path = reporter.generate_board(board_items, site_url=site_url)
+        path = reporter.generate_board(board_items, site_url=site_url, compress=gzip_output)
 
         # Generate Feed
-        feed_path = reporter.generate_feed(board_items, site_url=site_url)
+        feed_path = reporter.generate_feed(board_items, site_url=site_url, compress=gzip_output)
 
         console.print(f"[bold green]✔ Job Board Generated: {path}[/bold green]")
         console.print(f"[bold green]✔ RSS Feed Generated: {feed_path}[/bold green]")
         console.print(f"  Includes {len(board_items)} opportunities.")
 
     # Run the async main
-    asyncio.run(run_batch())
+    _run_async(run_batch())
 
 
 
@@ -418,12 +549,12 @@ def _collect_managed_labels(rules_path: str) -> list[str]:
     status labels. Used to scope `labels_to_remove` so a human-added
     label is never silently removed.
     """
-    import yaml
+    from app.services.triage import load_yaml
 
     managed: set[str] = set(_BUILTIN_MANAGED_LABELS)
     try:
         with open(rules_path) as f:
-            raw = yaml.safe_load(f) or []
+            raw = load_yaml(f) or []
         if isinstance(raw, dict):
             raw = raw.get("rules", [])
         for rule in raw:
@@ -446,23 +577,58 @@ def action(
     GitHub Action Entrypoint.
     Automatically detects context from GITHUB_EVENT_PATH and configuration from repo.
     """
-    import json
     import os
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pydantic_core import from_json
 
     from app.core.config import settings
+    from app.models.schemas import warm_validators
     from app.services.cache import CacheManager
-    from app.services.github_service import GitHubService
 
     console.print("[bold blue]🚀 Starting AI Triage Action[/bold blue]")
 
+    # Fail before touching the event or the network if the LLM key is missing.
+    try:
+        settings.validate()
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(code=1)
+    warm_validators()
+
     # 1. Detect Context
     event_path = os.getenv("GITHUB_EVENT_PATH")
     if not event_path or not os.path.exists(event_path):
         console.print("[red]Error: GITHUB_EVENT_PATH not found. Are we running in an Action?[/red]")
         raise typer.Exit(code=1)
 
-    with open(event_path, "r") as f:
-        event = json.load(f)
+    # 2. "Polite Guest" Configuration Strategy
+    # Look for user config in multiple locations
+    if os.path.exists(".github/issueops.yaml"):
+        console.print("[green]Found config: .github/issueops.yaml[/green]")
+        rules_file = ".github/issueops.yaml"
+    elif os.path.exists(".github/triage.yaml"):
+        console.print("[yellow]Found legacy config: .github/triage.yaml (Please rename to issueops.yaml)[/yellow]")
+        rules_file = ".github/triage.yaml"
+    elif os.path.exists("rules.yaml"):
+        # Fallback to local default (bundled in container)
+        console.print("[dim]Using default rules.yaml[/dim]")
+        rules_file = "rules.yaml"
+    else:
+        rules_file = None
+
+    # Read the event and load the rules concurrently: both are independent
+    # open+read+parse chains on the cold-start path. The pipeline's
+    # get_triage() call then hits the registry cache, and still reports
+    # a broken rules file through its usual error handling.
+    def _read_event(path: str) -> dict:
+        with open(path, "rb") as f:
+            return from_json(f.read())
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        if rules_file:
+            pool.submit(get_triage, rules_file)
+        event = pool.submit(_read_event, event_path).result()
 
     # Extract Issue details
     # Matches 'issues' event or 'issue_comment' event
@@ -478,140 +644,146 @@ def action(
         console.print("[red]GITHUB_REPOSITORY missing.[/red]")
         raise typer.Exit(code=1)
 
-    owner, repo_name = repo_full.split("/")
+    try:
+        owner, repo_name = _parse_repo(repo_full)
+    except typer.BadParameter as e:
+        console.print(f"[red]Invalid GITHUB_REPOSITORY {repo_full!r}: {e}[/red]")
+        raise typer.Exit(code=1)
 
     console.print(f"Target: [cyan]{owner}/{repo_name}#{issue_number}[/cyan]")
 
-    # 2. "Polite Guest" Configuration Strategy
-    # Look for user config in multiple locations
-    # Look for user config in multiple locations
-    if os.path.exists(".github/issueops.yaml"):
-        console.print("[green]Found config: .github/issueops.yaml[/green]")
-        rules_file = ".github/issueops.yaml"
-    elif os.path.exists(".github/triage.yaml"):
-        console.print("[yellow]Found legacy config: .github/triage.yaml (Please rename to issueops.yaml)[/yellow]")
-        rules_file = ".github/triage.yaml"
-    elif os.path.exists("rules.yaml"):
-        # Fallback to local default (bundled in container)
-        console.print("[dim]Using default rules.yaml[/dim]")
-        rules_file = "rules.yaml"
-    else:
+    if not rules_file:
         console.print("[red]No rules configuration found![/red]")
         raise typer.Exit(code=1)
 
     # 3. Execution
     # Reuse the logic by calling the service components directly
     # (We can't easily call the other CLI commands, so we duplicate the simple flow)
+    # Every stage runs inside one event loop so HTTP/LLM clients keep their
+    # connection pools between fetch, duplicate check, extraction and apply.
 
-    with console.status("Running Triage Pipeline..."):
-        try:
-            gh = GitHubService(github_token=settings.GITHUB_TOKEN)
-            extractor = ExtractorService()
-            triage = TriageService(rules_file)
-
-            # Fetch
-            gh_issue = asyncio.run(gh.fetch_issue(owner, repo_name, issue_number))
-
-            # --- HUMAN OVERRIDE LOCK ---
-            if not force and _LOCK_LABELS.intersection(set(gh_issue.labels)):
-                console.print(
-                    f"[yellow]Skipping triage: lock label present "
-                    f"({_LOCK_LABELS.intersection(set(gh_issue.labels))}).[/yellow]"
-                )
-                return
-
-            # --- IDEMPOTENCY CHECK ---
-            cache_mgr = CacheManager()
-            body_for_signature = f"{gh_issue.title}\n{gh_issue.body or ''}"
-            if not force and cache_mgr.is_recently_processed(
-                owner, repo_name, issue_number, body_for_signature
-            ):
-                console.print(
-                    "[dim]Skipping: identical issue body was triaged within "
-                    "the idempotency window. Pass --force to override.[/dim]"
-                )
-                return
-
-            # --- DUPLICATE CHECK ---
-            from app.services.duplicate_service import DuplicateService
-            dupe_service = DuplicateService(gh, extractor)
-
-            dupe_result = asyncio.run(dupe_service.check_duplicate(owner, repo_name, gh_issue.title, gh_issue.body, gh_issue.number))
+    async def _pipeline() -> None:
+        with console.status("Running Triage Pipeline..."):
+            try:
+                gh = get_github_service()
+                extractor = get_extractor()
+                triage = get_triage(rules_file)
+
+                # Fetch
+                gh_issue = await gh.fetch_issue(owner, repo_name, issue_number)
+
+                # --- HUMAN OVERRIDE LOCK ---
+                if not force and _LOCK_LABELS.intersection(set(gh_issue.labels)):
+                    console.print(
+                        f"[yellow]Skipping triage: lock label present "
+                        f"({_LOCK_LABELS.intersection(set(gh_issue.labels))}).[/yellow]"
+                    )
+                    return
 
-            related_closed_issue_id = None
+                # --- IDEMPOTENCY CHECK ---
+                cache_mgr = CacheManager()
+                body_for_signature = (gh_issue.title, gh_issue.body or "")
+                if not force and cache_mgr.is_recently_processed(
+                    owner, repo_name, issue_number, body_for_signature
+                ):
+                    console.print(
+                        "[dim]Skipping: identical issue body was triaged within "
+                        "the idempotency window. Pass --force to override.[/dim]"
+                    )
+                    return
 
-            if dupe_result.confidence >= 0.9 and dupe_result.duplicate_number:
-                # BRANCH LOGIC: Open vs Closed
-                if dupe_result.matched_issue_state == 'open':
-                     console.print(f"[bold red]DUPLICATE DETECTED (OPEN):[/bold red] #{dupe_result.duplicate_number}")
-                     console.print(f"Reason: {dupe_result.reasoning}")
+                # --- DUPLICATE CHECK ---
+                from app.services.duplicate_service import DuplicateService
+                dupe_service = DuplicateService(gh, extractor)
 
+                # Duplicate search and metadata extraction both only need the raw
+                # issue, so their LLM/API round-trips overlap. If the issue turns
+                # out to be an open duplicate the metadata is unused (but cached).
+                dupe_check = dupe_service.check_duplicate(
+                    owner, repo_name, gh_issue.title, gh_issue.body, gh_issue.number
+                )
+                fast_meta = extractor.fast_path(gh_issue.title, gh_issue.body or "")
+                if fast_meta:
+                    dupe_result, meta = await dupe_check, fast_meta
+                else:
+                    dupe_result, meta = await asyncio.gather(
+                        dupe_check,
+                        extractor.extract([gh_issue.title, gh_issue.body or "", *gh_issue.comments]),
+                    )
+
+                related_closed_issue_id = None
+
+                if dupe_result.confidence >= 0.9 and dupe_result.duplicate_number:
+                    # BRANCH LOGIC: Open vs Closed
+                    if dupe_result.matched_issue_state == 'open':
+                         console.print(f"[bold red]DUPLICATE DETECTED (OPEN):[/bold red] #{dupe_result.duplicate_number}")
+                         console.print(f"Reason: {dupe_result.reasoning}")
+
+                         if apply:
+                             msg = f"Marking as duplicate of #{dupe_result.duplicate_number}.\nLogic: {dupe_result.reasoning}"
+                             await gh.upsert_comment(owner, repo_name, issue_number, msg, _TRIAGE_COMMENT_MARKER)
+                             await gh.apply_labels(owner, repo_name, issue_number, ["duplicate"])
+                         else:
+                             console.print(f"[dim][DRY RUN] Would comment 'Duplicate of #{dupe_result.duplicate_number}' and label as 'duplicate'[/dim]")
+                         return
+
+                    elif dupe_result.matched_issue_state == 'closed':
+                         console.print(f"[bold blue]PRIOR ART DETECTED (CLOSED):[/bold blue] #{dupe_result.duplicate_number}")
+                         console.print("Continuing analysis, but linking to this solved case.")
+                         related_closed_issue_id = dupe_result.duplicate_number
+
+                if 0.7 <= dupe_result.confidence < 0.9 and dupe_result.duplicate_number:
                      if apply:
-                         msg = f"Marking as duplicate of #{dupe_result.duplicate_number}.\nLogic: {dupe_result.reasoning}"
-                         asyncio.run(gh.upsert_comment(owner, repo_name, issue_number, msg, _TRIAGE_COMMENT_MARKER))
-                         asyncio.run(gh.apply_labels(owner, repo_name, issue_number, ["duplicate"]))
+                         msg = f"Possible duplicate of #{dupe_result.duplicate_number} (Confidence: {dupe_result.confidence:.2f}). Please check."
+                         await gh.upsert_comment(owner, repo_name, issue_number, msg, _TRIAGE_COMMENT_MARKER)
                      else:
-                         console.print(f"[dim][DRY RUN] Would comment 'Duplicate of #{dupe_result.duplicate_number}' and label as 'duplicate'[/dim]")
-                     return
-
-                elif dupe_result.matched_issue_state == 'closed':
-                     console.print(f"[bold blue]PRIOR ART DETECTED (CLOSED):[/bold blue] #{dupe_result.duplicate_number}")
-                     console.print("Continuing analysis, but linking to this solved case.")
-                     related_closed_issue_id = dupe_result.duplicate_number
-
-            if 0.7 <= dupe_result.confidence < 0.9 and dupe_result.duplicate_number:
-                 if apply:
-                     msg = f"Possible duplicate of #{dupe_result.duplicate_number} (Confidence: {dupe_result.confidence:.2f}). Please check."
-                     asyncio.run(gh.upsert_comment(owner, repo_name, issue_number, msg, _TRIAGE_COMMENT_MARKER))
-                 else:
-                     console.print(f"[dim][DRY RUN] Would comment 'Possible duplicate of #{dupe_result.duplicate_number}'[/dim]")
-            # -----------------------
+                         console.print(f"[dim][DRY RUN] Would comment 'Possible duplicate of #{dupe_result.duplicate_number}'[/dim]")
+                # -----------------------
 
-            # Extract
-            text = f"{gh_issue.title}\n{gh_issue.body}\n" + "\n".join(gh_issue.comments)
-            meta = asyncio.run(extractor.extract(text))
+                # Inject Prior Art
+                if related_closed_issue_id:
+                    meta.related_closed_issue_id = related_closed_issue_id
 
-            # Inject Prior Art
-            if related_closed_issue_id:
-                meta.related_closed_issue_id = related_closed_issue_id
+                # Decide
+                action_result = triage.evaluate(meta)
 
-            # Decide
-            action_result = triage.evaluate(meta)
+            except Exception as e:
+                console.print(f"[red]Pipeline Failed: {e}[/red]")
+                raise typer.Exit(code=1)
 
-        except Exception as e:
-            console.print(f"[red]Pipeline Failed: {e}[/red]")
-            raise typer.Exit(code=1)
+        # 4. Report
+        console.print(Panel(f"Decision: P{action_result.priority_score}", title="AI Triage Result", style="green"))
+        console.print(f"Labels: {', '.join(action_result.labels)}")
+        console.print(f"Reason: {action_result.reasoning}")
+
+        # 5. Apply — diff-based, never overwrites human-owned labels.
+        if apply:
+            managed = _collect_managed_labels(rules_file)
+            with console.status("Applying to GitHub..."):
+                success = await gh.sync_labels(
+                    owner,
+                    repo_name,
+                    issue_number,
+                    current_labels=gh_issue.labels,
+                    desired_labels=action_result.labels,
+                    labels_to_remove=action_result.labels_to_remove,
+                    managed_labels=managed,
+                )
+                if success:
+                    console.print("[bold green]✔ Labels synced[/bold green]")
+                    cache_mgr.mark_processed(owner, repo_name, issue_number, body_for_signature)
+                else:
+                    console.print("[bold red]✘ Failed to sync labels[/bold red]")
+                    raise typer.Exit(code=1)
 
-    # 4. Report
-    console.print(Panel(f"Decision: P{action_result.priority_score}", title="AI Triage Result", style="green"))
-    console.print(f"Labels: {', '.join(action_result.labels)}")
-    console.print(f"Reason: {action_result.reasoning}")
-
-    # 5. Apply — diff-based, never overwrites human-owned labels.
-    if apply:
-        managed = _collect_managed_labels(rules_file)
-        with console.status("Applying to GitHub..."):
-            success = asyncio.run(gh.sync_labels(
-                owner,
-                repo_name,
-                issue_number,
-                current_labels=gh_issue.labels,
-                desired_labels=action_result.labels,
-                labels_to_remove=action_result.labels_to_remove,
-                managed_labels=managed,
-            ))
-            if success:
-                console.print("[bold green]✔ Labels synced[/bold green]")
-                cache_mgr.mark_processed(owner, repo_name, issue_number, body_for_signature)
-                cache_mgr.save()
-            else:
-                console.print("[bold red]✘ Failed to sync labels[/bold red]")
-                raise typer.Exit(code=1)
+    _run_async(_pipeline())
 
 @app.command()
 def audit(
-    repo: Annotated[str, typer.Argument(help="Repository 'owner/repo'")],
-    limit: int = typer.Option(10, help="Number of issues to scan")
+    repo: RepoArg,
+    limit: int = typer.Option(10, help="Number of issues to scan"),
+    concurrency: int = typer.Option(8, min=1, help="Maximum number of issues analysed concurrently"),
+    delay: float = typer.Option(0.0, help="Delay (in seconds) between requests to avoid Rate Limiting")
 ):
     """
     Generate a CSV for manual accuracy auditing.
@@ -619,58 +791,68 @@ def audit(
     """
     import csv
 
-    from app.core.config import settings
-    from app.services.github_service import GitHubService
+    owner, repo_name = repo
 
     # Async Logic
     async def run_audit():
         with console.status(f"Fetching {limit} issues from {repo}..."):
-            gh = GitHubService(github_token=settings.GITHUB_TOKEN)
-            extractor = ExtractorService()
-            triage = TriageService("rules.yaml")
-
-            if "/" not in repo:
-                 console.print("[red]Repo must be 'owner/repo'[/red]")
-                 raise typer.Exit(code=1)
-            owner, repo_name = repo.split("/")
+            gh = get_github_service()
+            extractor = get_extractor()
+            triage = get_triage("rules.yaml")
 
             issues = await gh.fetch_issues(owner, repo_name, limit=limit)
             console.print(f"[blue]Found {len(issues)} issues. analyzing...[/blue]")
 
-        results = []
-        with console.status("Analysing..."):
-            for issue in issues:
-                text = f"{issue.title}\n{issue.body}"
+        # Overlap LLM round-trips, but never more than `concurrency` in flight.
+        sem = asyncio.Semaphore(concurrency)
+
+        async def analyze_issue(issue):
+            async with sem:
                 try:
-                    meta = await extractor.extract(text)
+                    meta = extractor.fast_path(issue.title, issue.body or "") or await extractor.extract(
+                        (issue.title, issue.body or "")
+                    )
                     action = triage.evaluate(meta)
-                    results.append({
-                        "id": issue.number,
-                        "title": issue.title,
-                        "ai_difficulty": meta.difficulty,
-                        "ai_priority": action.priority_score,
-                        "ai_skills": ", ".join(meta.required_skills),
-                        "human_difficulty": "",  # For user to fill
-                        "human_priority": "",    # For user to fill
-                        "notes": ""
-                    })
                 except Exception as e:
                     console.print(f"[red]Error on #{issue.number}: {e}[/red]")
-
-        # Write CSV
+                    return None
+                if delay > 0:
+                    # Hold the slot so each worker paces its own requests.
+                    await asyncio.sleep(delay)
+                return {
+                    "id": issue.number,
+                    "title": issue.title,
+                    "ai_difficulty": meta.difficulty,
+                    "ai_priority": action.priority_score,
+                    "ai_skills": ", ".join(meta.required_skills),
+                    "human_difficulty": "",  # For user to fill
+                    "human_priority": "",    # For user to fill
+                    "notes": ""
+                }
+
+        # Stream each row to disk as soon as its analysis finishes: constant
+        # memory, visible progress, and completed rows survive a Ctrl-C.
         filename = f"audit_{owner}_{repo_name}.csv"
         with open(filename, "w", newline="") as csvfile:
             fieldnames = ["id", "title", "ai_difficulty", "ai_priority", "ai_skills", "human_difficulty", "human_priority", "notes"]
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
 
             writer.writeheader()
-            for r in results:
-                writer.writerow(r)
+            written = 0
+            with console.status(f"Analysing (concurrency={concurrency}, delay={delay}s)...") as status:
+                for fut in asyncio.as_completed([analyze_issue(i) for i in issues]):
+                    row = await fut
+                    if not row:
+                        continue
+                    writer.writerow(row)
+                    csvfile.flush()
+                    written += 1
+                    status.update(f"Analysing... {written}/{len(issues)} written")
 
         console.print(f"[bold green]✔ Audit CSV generated: {filename}[/bold green]")
         console.print("Open this file to compare AI predictions vs Reality.")
 
-    asyncio.run(run_audit())
+    _run_async(run_audit())
 
 if __name__ == "__main__":
     app()
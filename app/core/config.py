@@ -1,4 +1,5 @@
 import os
+from dataclasses import dataclass, field
 from functools import lru_cache
 from typing import Optional
 
@@ -7,16 +8,20 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+@dataclass(slots=True, frozen=True)
 class Settings:
-    """Application configuration — loaded from environment variables."""
+    """
+    Application configuration — read from environment variables once, when the
+    singleton is built. Frozen so it can be shared by the cached service factories.
+    """
 
-    GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
-    GITHUB_TOKEN: Optional[str] = os.getenv("GITHUB_TOKEN", None)
+    GEMINI_API_KEY: str = field(default_factory=lambda: os.getenv("GEMINI_API_KEY", ""))
+    GITHUB_TOKEN: Optional[str] = field(default_factory=lambda: os.getenv("GITHUB_TOKEN"))
 
-    LLM_MODEL: str = os.getenv("LLM_MODEL", "gemini-2.5-flash")
-    MIN_CONFIDENCE: float = float(os.getenv("MIN_CONFIDENCE", "0.75"))
+    LLM_MODEL: str = field(default_factory=lambda: os.getenv("LLM_MODEL", "gemini-2.5-flash"))
+    MIN_CONFIDENCE: float = field(default_factory=lambda: float(os.getenv("MIN_CONFIDENCE", "0.75")))
 
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVEL: str = field(default_factory=lambda: os.getenv("LOG_LEVEL", "INFO"))
 
     def validate(self) -> bool:
         if not self.GEMINI_API_KEY:
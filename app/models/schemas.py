@@ -49,9 +49,12 @@ class IssueMetadata(BaseModel):
     related_closed_issue_id: Optional[int] = Field(None, description="ID of a similar closed issue as solution blueprint.")
 
     extraction_confidence: float = Field(..., ge=0.0, le=1.0)
-    extraction_mode: Literal["llm", "fallback"] = Field(
+    extraction_mode: Literal["llm", "fallback", "heuristic"] = Field(
         "llm",
-        description="'llm' = Gemini call; 'fallback' = circuit-breaker regex path.",
+        description=(
+            "'llm' = Gemini call; 'fallback' = circuit-breaker regex path; "
+            "'heuristic' = title-prefix fast path, no LLM call."
+        ),
     )
 
 
@@ -71,6 +74,9 @@ class TriageAction(BaseModel):
 
 class RuleDefinition(BaseModel):
     """Strict definition of a single Rule in rules.yaml."""
+    # Only needed once rules are loaded — don't pay schema build cost at import.
+    model_config = ConfigDict(defer_build=True)
+
     name: str = Field(..., min_length=1, description="Unique name for the rule.")
     condition: Dict[str, Any] = Field(..., description="Valid JSON-Logic logical condition.")
     action: TriageAction = Field(..., description="Action to take if condition is true.")
@@ -78,6 +84,8 @@ class RuleDefinition(BaseModel):
 
 class DuplicateResult(BaseModel):
     """Result of semantic duplicate verification."""
+    model_config = ConfigDict(defer_build=True)
+
     duplicate_number: Optional[int] = Field(None, description="Issue number of duplicate, or null.")
     matched_issue_state: Optional[str] = Field(None, description="State of the matched issue: 'open' or 'closed'.")
     confidence: float = Field(..., ge=0.0, le=1.0, description="Confidence score 0.0-1.0")
@@ -90,3 +98,13 @@ class RuleResult(BaseModel):
     matched: bool
     action: Optional[TriageAction] = None
     evaluation_data: Optional[Dict[str, Any]] = None
+
+
+def warm_validators() -> None:
+    """
+    Force-build the deferred validators. The action pipeline validates every
+    model on a single run, so it calls this during cold start rather than
+    paying the build cost mid-request, after the first LLM round-trip.
+    """
+    for model in (RuleDefinition, DuplicateResult):
+        model.model_rebuild()
@@ -1,94 +1,230 @@
 import hashlib
-import json
 import logging
-import os
+import re
+import sqlite3
 import time
-from typing import Any, Dict, Optional
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Iterable, Optional, Sequence, Tuple, Union
 
-from app.models.schemas import IssueMetadata
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.models.schemas import DuplicateResult, IssueMetadata
 
 logger = logging.getLogger(__name__)
 
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS cache "
+    "(kind TEXT NOT NULL, key TEXT NOT NULL, blob TEXT NOT NULL, PRIMARY KEY (kind, key))",
+    "CREATE TABLE IF NOT EXISTS processed_signatures "
+    "(key TEXT PRIMARY KEY, sha TEXT NOT NULL, ts REAL NOT NULL)",
+)
+
+
+_TRAILING_WS = re.compile(r"[ \t]+$", re.MULTILINE)
+_BLANK_RUNS = re.compile(r"\n{3,}")
+# Only complete tags with a well-known HTML name, so code such as `List<String>`
+# or `a<B` keeps its case. Group 1 is the tag name; attributes are left alone.
+_HTML_TAG = re.compile(
+    r"(?<=<)/?(a|b|i|u|s|p|br|hr|em|strong|code|pre|kbd|sub|sup|div|span|img|ul|ol|li"
+    r"|table|thead|tbody|tr|td|th|h[1-6]|blockquote|details|summary)(?=(?:\s[^<>]*)?/?>)",
+    re.IGNORECASE,
+)
+
+
+def _normalize(text: str) -> str:
+    """
+    Canonicalise cosmetic differences that GitHub edits introduce (CRLF, trailing
+    spaces, extra blank lines, surrounding whitespace, tag case) so they don't
+    cause cache misses.
+    """
+    text = text.replace("\r\n", "\n").strip()
+    text = _TRAILING_WS.sub("", text)
+    text = _BLANK_RUNS.sub("\n\n", text)
+    return _HTML_TAG.sub(lambda m: m.group(0).lower(), text)
+
+
+# Cache inputs are either one string or its parts (e.g. title, body, comments),
+# which are hashed incrementally rather than concatenated first.
+CacheText = Union[str, Sequence[str]]
+
+
+def _as_parts(text: CacheText) -> Tuple[str, ...]:
+    return (text,) if isinstance(text, str) else tuple(text)
+
+
+@lru_cache(maxsize=256)
+def _digest(*parts: str) -> str:
+    """128-bit BLAKE2b digest of the normalised parts, memoised for re-scans."""
+    h = hashlib.blake2b(digest_size=16)
+    for i, part in enumerate(parts):
+        if i:
+            h.update(b"\0")
+        h.update(_normalize(part).encode("utf-8"))
+    return h.hexdigest()
+
 
 class CacheManager:
     """
     Two-tier persistence:
-      1. `cache`: SHA-256(issue_text) → IssueMetadata payload.
-         Skips LLM re-analysis when body content is unchanged.
-      2. `processed_signatures`: f"{owner}/{repo}#{issue_number}" → {sha, ts}.
+      1. `cache`: (kind, digest(input)) → LLM output, namespaced by operation:
+         "metadata" (IssueMetadata JSON), "metadata_batch" (the same, from
+         batched prompts), "keywords" (search string) and "dupe"
+         (DuplicateResult JSON). Skips LLM calls when content is unchanged.
+      2. `processed_signatures`: f"{owner}/{repo}#{issue_number}" → (sha, ts).
          Skips full triage rerun (labels, comments) when body sha + recent run
          indicate a duplicate Action invocation (e.g. workflow retry).
 
-    Both layers persist to a single JSON file under separate top-level keys.
+    Both layers live in one SQLite file (WAL mode). Every write is a single-row
+    upsert committed immediately, so there is no separate save step and write
+    cost does not grow with the size of the cache.
+
+    A bounded in-process LRU sits in front of the `cache` table so repeated
+    lookups within one run skip both the SQLite read and Pydantic validation.
+
+    Extraction keys are namespaced by `namespace` (the LLM model name by default)
+    so switching models never serves answers produced by the previous one.
     """
 
-    SCHEMA_VERSION = 2
+    SCHEMA_VERSION = 4
     DEFAULT_IDEMPOTENCY_WINDOW_S = 24 * 60 * 60  # 24h
+    MEMO_SIZE = 1024
 
-    def __init__(self, cache_path: str = ".triage_cache.json"):
+    # Every open manager, so a CLI run can close them all before it exits.
+    _instances: "weakref.WeakSet[CacheManager]" = weakref.WeakSet()
+
+    def __init__(self, cache_path: str = ".triage_cache.db", namespace: Optional[str] = None):
         self.cache_path = cache_path
-        self.cache: Dict[str, Any] = {}
-        self.processed_signatures: Dict[str, Dict[str, Any]] = {}
-        self.load()
-
-    def _compute_hash(self, text: str) -> str:
-        """Generate a deterministic hash for the content."""
-        return hashlib.sha256(text.encode("utf-8")).hexdigest()
-
-    def load(self) -> None:
-        """Load cache from disk. Supports v1 (flat dict) and v2 (wrapped) layouts."""
-        if not os.path.exists(self.cache_path):
-            return
+        self.namespace = namespace if namespace is not None else settings.LLM_MODEL
+        self._memo: OrderedDict[str, IssueMetadata] = OrderedDict()
+        try:
+            self._conn = self._open(cache_path)
+        except sqlite3.DatabaseError as e:
+            logger.warning(f"Failed to open cache {cache_path}: {e}. Using in-memory cache.")
+            self._conn = self._open(":memory:")
+        CacheManager._instances.add(self)
+
+    def _open(self, path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(path, isolation_level=None)
         try:
-            with open(self.cache_path) as f:
-                raw = json.load(f)
-        except Exception as e:
-            logger.warning(f"Failed to load cache: {e}. Starting fresh.")
-            return
-
-        if isinstance(raw, dict) and raw.get("_schema_version") == self.SCHEMA_VERSION:
-            self.cache = raw.get("cache", {})
-            self.processed_signatures = raw.get("processed_signatures", {})
-        else:
-            # Legacy v1 file: a flat dict of sha → metadata.
-            self.cache = raw if isinstance(raw, dict) else {}
-            self.processed_signatures = {}
-
-        logger.info(
-            f"Loaded {len(self.cache)} cached extractions, "
-            f"{len(self.processed_signatures)} processed signatures."
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, self.SCHEMA_VERSION):
+                # Cache contents are always re-derivable — drop rather than migrate.
+                logger.info(f"Cache schema v{version} is stale; rebuilding.")
+                conn.execute("DROP TABLE IF EXISTS cache")
+                conn.execute("DROP TABLE IF EXISTS processed_signatures")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        except sqlite3.DatabaseError:
+            conn.close()
+            raise
+        return conn
+
+    def close(self) -> None:
+        """
+        Close the underlying SQLite connection. Closing the last connection
+        checkpoints the WAL into the main file, so `.triage_cache.db` alone
+        holds every entry (e.g. for the actions/cache step).
+        """
+        self._conn.close()
+        CacheManager._instances.discard(self)
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Close every CacheManager still open in this process."""
+        for cache in list(cls._instances):
+            cache.close()
+
+    def _compute_hash(self, *parts: str) -> str:
+        """
+        Generate a deterministic 128-bit digest for the normalised content. Used
+        purely as a lookup key, so a fast non-cryptographic-strength digest is fine.
+        """
+        return _digest(*parts)
+
+    def _cache_key(self, text: CacheText, *extra: str) -> str:
+        return self._compute_hash(self.namespace, *_as_parts(text), *extra)
+
+    def _remember(self, key: str, metadata: IssueMetadata) -> None:
+        self._memo[key] = metadata
+        self._memo.move_to_end(key)
+        if len(self._memo) > self.MEMO_SIZE:
+            self._memo.popitem(last=False)
+
+    def _read(self, kind: str, key: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT blob FROM cache WHERE kind = ? AND key = ?", (kind, key)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _write(self, kind: str, key: str, blob: str) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO cache (kind, key, blob) VALUES (?, ?, ?)",
+            (kind, key, blob),
         )
 
-    def save(self) -> None:
-        """Persist both caches under the v2 envelope."""
-        payload = {
-            "_schema_version": self.SCHEMA_VERSION,
-            "cache": self.cache,
-            "processed_signatures": self.processed_signatures,
-        }
+    def _get_by_key(self, kind: str, key: str) -> Optional[IssueMetadata]:
+        memo_key = f"{kind}:{key}"
+        memo = self._memo.get(memo_key)
+        if memo is not None:
+            self._memo.move_to_end(memo_key)
+            return memo.model_copy()
+
+        blob = self._read(kind, key)
+        if blob is None:
+            return None
         try:
-            with open(self.cache_path, "w") as f:
-                json.dump(payload, f)
-            logger.info(f"Saved cache to {self.cache_path}")
-        except Exception as e:
-            logger.error(f"Failed to save cache: {e}")
-
-    def get(self, text: str) -> Optional[IssueMetadata]:
-        """Retrieve metadata if text matches cache."""
-        key = self._compute_hash(text)
-        data = self.cache.get(key)
-        if data:
-            try:
-                # Deserialize back to Pydantic model
-                return IssueMetadata(**data)
-            except Exception:
-                return None
-        return None
-
-    def set(self, text: str, metadata: IssueMetadata) -> None:
+            metadata = IssueMetadata.model_validate_json(blob)
+        except ValidationError:
+            return None
+        self._remember(memo_key, metadata)
+        # Hand out copies: callers (e.g. prior-art injection) mutate the result.
+        return metadata.model_copy()
+
+    def get(self, text: CacheText, kind: str = "metadata") -> Optional[IssueMetadata]:
+        """
+        Retrieve metadata if text matches cache. `kind` separates extractions
+        made from different views of the text ("metadata_batch" for batched
+        prompts, which see a truncated copy).
+        """
+        return self._get_by_key(kind, self._cache_key(text))
+
+    def set(self, text: CacheText, metadata: IssueMetadata, kind: str = "metadata") -> None:
         """Store metadata in cache."""
-        key = self._compute_hash(text)
-        self.cache[key] = metadata.model_dump()
+        key = self._cache_key(text)
+        self._write(kind, key, metadata.model_dump_json())
+        self._remember(f"{kind}:{key}", metadata.model_copy())
+
+    def get_keywords(self, text: CacheText) -> Optional[str]:
+        """Retrieve previously generated duplicate-search keywords for text."""
+        return self._read("keywords", self._cache_key(text))
+
+    def set_keywords(self, text: CacheText, keywords: str) -> None:
+        self._write("keywords", self._cache_key(text), keywords)
+
+    def _dupe_key(self, text: CacheText, candidate_numbers: Iterable[int]) -> str:
+        numbers = ",".join(str(n) for n in sorted(candidate_numbers))
+        return self._cache_key(text, numbers)
+
+    def get_dupe_result(self, text: CacheText, candidate_numbers: Iterable[int]) -> Optional[DuplicateResult]:
+        """Retrieve a semantic-duplicate verdict for text against this candidate set."""
+        blob = self._read("dupe", self._dupe_key(text, candidate_numbers))
+        if blob is None:
+            return None
+        try:
+            return DuplicateResult.model_validate_json(blob)
+        except ValidationError:
+            return None
+
+    def set_dupe_result(
+        self, text: CacheText, candidate_numbers: Iterable[int], result: DuplicateResult
+    ) -> None:
+        self._write("dupe", self._dupe_key(text, candidate_numbers), result.model_dump_json())
 
     @staticmethod
     def _signature_key(owner: str, repo: str, issue_number: int) -> str:
@@ -99,7 +235,7 @@ class CacheManager:
         owner: str,
         repo: str,
         issue_number: int,
-        body: str,
+        body: CacheText,
         window_seconds: int = DEFAULT_IDEMPOTENCY_WINDOW_S,
     ) -> bool:
         """
@@ -107,18 +243,21 @@ class CacheManager:
         the idempotency window. Callers should short-circuit triage in that case.
         """
         key = self._signature_key(owner, repo, issue_number)
-        prior = self.processed_signatures.get(key)
-        if not prior:
+        prior = self._conn.execute(
+            "SELECT sha, ts FROM processed_signatures WHERE key = ?", (key,)
+        ).fetchone()
+        if prior is None:
             return False
-        if prior.get("sha") != self._compute_hash(body):
+        sha, ts = prior
+        if sha != self._compute_hash(*_as_parts(body)):
             return False
-        age = time.time() - float(prior.get("ts", 0))
+        age = time.time() - float(ts)
         return age < window_seconds
 
-    def mark_processed(self, owner: str, repo: str, issue_number: int, body: str) -> None:
+    def mark_processed(self, owner: str, repo: str, issue_number: int, body: CacheText) -> None:
         """Record that this issue+body was fully triaged at the current time."""
         key = self._signature_key(owner, repo, issue_number)
-        self.processed_signatures[key] = {
-            "sha": self._compute_hash(body),
-            "ts": time.time(),
-        }
+        self._conn.execute(
+            "INSERT OR REPLACE INTO processed_signatures (key, sha, ts) VALUES (?, ?, ?)",
+            (key, self._compute_hash(*_as_parts(body)), time.time()),
+        )
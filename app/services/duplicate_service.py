@@ -1,4 +1,7 @@
+import asyncio
 import logging
+import re
+from typing import Optional
 
 from app.models.schemas import DuplicateResult
 from app.services.extractor import ExtractorService
@@ -6,10 +9,46 @@ from app.services.github_service import GitHubService
 
 logger = logging.getLogger(__name__)
 
+_TITLE_NOISE = re.compile(r"[^a-z0-9 ]+")
+_TITLE_SPACES = re.compile(r" {2,}")
+# Short titles ("Bug", "Crash on startup") collide across unrelated issues, so
+# the exact-title probe only runs for titles with at least this many words.
+_MIN_EXACT_TITLE_WORDS = 4
+# Below the action's 0.9 auto-label gate: an identical title alone only earns
+# a "possible duplicate" comment, never the `duplicate` label.
+_EXACT_TITLE_CONFIDENCE = 0.85
+# High-signal search terms the keyword prompt ranks first: hex codes, errno
+# names, E_/ERR_-prefixed error codes and exception class names. Plain
+# CONSTANT_CASE is deliberately excluded so env vars (GITHUB_TOKEN) don't count.
+_SIGNAL_TOKENS = re.compile(
+    r"\b(?:0x[0-9a-fA-F]{4,}"
+    r"|E(?:CONN[A-Z]+|NO[A-Z]{2,}|ACCES|PERM|PIPE|TIMEDOUT|ADDR[A-Z]+|HOSTUNREACH"
+    r"|NETUNREACH|AGAIN|EXIST|INVAL|MFILE|BUSY)"
+    r"|E(?:RR(?:OR)?)?_[A-Z0-9_]+"
+    r"|[A-Z]\w*(?:Error|Exception))\b"
+)
+
+
+def _normalize_title(title: str) -> str:
+    """Lowercase, drop punctuation and collapse spaces: 'Fix: Crash!' → 'fix crash'."""
+    return _TITLE_SPACES.sub(" ", _TITLE_NOISE.sub(" ", title.lower())).strip()
+
+
+def _signal_keywords(text: str, limit: int = 5) -> str:
+    """
+    Search keywords taken straight from the issue text when it names at least
+    two distinct error tokens; empty otherwise (the LLM picks keywords then).
+    """
+    tokens = list(dict.fromkeys(_SIGNAL_TOKENS.findall(text)))
+    return " ".join(tokens[:limit]) if len(tokens) >= 2 else ""
+
+
 class DuplicateService:
     """
     Orchestrates the Duplicate Detection pipeline.
-    1. Keyword Extraction (LLM)
+    0. Exact Title Match (GitHub only — flags a possible duplicate and
+       short-circuits the remaining steps; titles of 4+ words only)
+    1. Keyword Extraction (error tokens in the text, else LLM concurrent with step 0)
     2. Candidate Search (GitHub)
     3. Semantic Verification (LLM)
     """
@@ -18,16 +57,57 @@ class DuplicateService:
         self.gh = github_service
         self.extractor = extractor_service
 
+    async def _find_exact_title_match(
+        self, owner: str, repo: str, title: str, current_issue_id: int
+    ) -> Optional[DuplicateResult]:
+        """Cheap pre-check: one GitHub search, no LLM calls."""
+        normalized = _normalize_title(title)
+        if len(normalized.split()) < _MIN_EXACT_TITLE_WORDS:
+            return None
+        try:
+            candidates = await self.gh.search_issues(owner, repo, f"{normalized} in:title")
+        except Exception as e:
+            logger.warning(f"Exact title search failed: {e}")
+            return None
+
+        for c in candidates:
+            if c['number'] != current_issue_id and _normalize_title(c['title']) == normalized:
+                logger.info(f"Exact title match: #{c['number']}")
+                return DuplicateResult(
+                    duplicate_number=c['number'],
+                    matched_issue_state=c['state'],
+                    confidence=_EXACT_TITLE_CONFIDENCE,
+                    reasoning=f"Title is identical to #{c['number']}.",
+                )
+        return None
+
     async def check_duplicate(self, owner: str, repo: str, title: str, body: str, current_issue_id: int) -> DuplicateResult:
         full_text = f"{title}\n{body}"
 
-        # 1. Generate Keywords
-        try:
-            keywords = await self.extractor.generate_search_keywords(full_text)
-            logger.info(f"Generated Search Keywords: {keywords}")
-        except Exception as e:
-            logger.warning(f"Keyword generation failed: {e}")
-            return DuplicateResult(duplicate_number=None, matched_issue_state=None, confidence=0.0, reasoning="Keyword gen failed")
+        # 1. Keywords: error tokens in the text need no LLM call. Otherwise the
+        # exact-title probe (GitHub) and keyword generation (LLM) are independent,
+        # so run them together; the keywords are dropped on an exact match.
+        keywords = _signal_keywords(full_text)
+        keywords_task = None
+        if not keywords:
+            keywords_task = asyncio.create_task(self.extractor.generate_search_keywords(full_text))
+
+        # 0. Exact title match
+        exact = await self._find_exact_title_match(owner, repo, title, current_issue_id)
+        if exact:
+            if keywords_task:
+                keywords_task.cancel()
+            return exact
+
+        if keywords_task:
+            try:
+                keywords = await keywords_task
+                logger.info(f"Generated Search Keywords: {keywords}")
+            except Exception as e:
+                logger.warning(f"Keyword generation failed: {e}")
+                return DuplicateResult(duplicate_number=None, matched_issue_state=None, confidence=0.0, reasoning="Keyword gen failed")
+        else:
+            logger.info(f"Search keywords from issue text: {keywords}")
 
         if not keywords:
             return DuplicateResult(duplicate_number=None, matched_issue_state=None, confidence=0.0, reasoning="No keywords found")
@@ -1,15 +1,17 @@
-import json
+import asyncio
 import logging
 import re
+import time
+from typing import Callable, List, Optional, Sequence
 
 from google import genai
 from google.genai import types
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 
 from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError
 from app.core.config import settings
 from app.models.schemas import DuplicateResult, IssueMetadata
-from app.services.cache import CacheManager
+from app.services.cache import CacheManager, CacheText, _as_parts
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +30,86 @@ _STACKTRACE_PATTERNS = re.compile(
     re.IGNORECASE | re.MULTILINE,
 )
 
+# Conventional-commit style titles that are safe to classify without the LLM.
+_FAST_PATH_TITLE = re.compile(r"^\s*(typo|docs?|chore)\s*(\([^)]*\))?\s*:", re.IGNORECASE)
+
+_EXTRACTION_GUIDE = """1. MAINTAINERS: Who need to know if it's a critical crash or security risk.
+2. CONTRIBUTORS: Who need to know if it's a "Good First Issue" (easy, clear skills).
+
+STRICT INSTRUCTIONS:
+1. Output ONLY valid JSON.
+2. For 'difficulty':
+   - "easy": Typos, documentation, simple CSS/Text changes.
+   - "medium": isolated bug fix, single function change.
+   - "hard": Architectural change, race conditions, core logic.
+3. For 'required_skills': specific languages or tools (e.g. "python", "react", "sql"). Lowercase only.
+4. For 'summary': A single, simple sentence describing the goal.
+
+SCHEMA REFERENCE:
+- has_reproduction_steps, has_stacktrace, has_logs (bool)
+- is_crash, is_security_issue, is_blocker (bool)
+- operating_system (str|null), environment (str)
+- summary (str): Non-technical summary.
+- difficulty (str): "easy", "medium", "hard", "unknown"
+- required_skills (List[str]): e.g. ["python", "docker"]
+- primary_area (str): "frontend", "backend" etc.
+- verification_hint (str|null): A single shell command to verify the fix. Infer from file paths/stacktrace.
+- extraction_confidence (float): 0.0 to 1.0
+"""
+# Static prompt preambles, built once; only the issue text is appended per call.
+_EXTRACTION_PROMPT_PREFIX = f"""You are a technical screener for an Open Source Project.
+Your job is to analyze the GitHub Issue below and extract structured metadata for two audiences:
+{_EXTRACTION_GUIDE}
+ISSUE TEXT:
+"""
+_KEYWORDS_PROMPT_PREFIX = """You are a search query optimizer.
+Extract 3-5 unique technical keywords from the issue below to find duplicates.
+PRIORITY:
+1. Hex codes, Error Constants, Exception Names.
+2. Distinctive terms (deadlock, race condition).
+3. EXCLUDE generic words (bug, error, help, crash).
+
+Output ONLY the space-separated keywords string.
+
+ISSUE:
+"""
+# Per-issue text budget inside a batched prompt (single prompts allow 10k).
+_BATCH_ISSUE_CHARS = 4000
+_METADATA_LIST = TypeAdapter(List[IssueMetadata])
+_BATCH_CACHE_KIND = "metadata_batch"
+# JSON mode: the model returns the bare JSON document, with no fences or
+# explanation around it, so generation stops when the object is closed.
+_JSON_CONFIG = types.GenerateContentConfig(temperature=0.0, response_mime_type="application/json")
+# Leading/trailing markdown code fence around an LLM JSON reply.
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+
+def _strip_fences(text: str) -> str:
+    """
+    Remove a surrounding ```json fence in one pass (validators accept surrounding
+    whitespace). JSON mode should not emit one; this guards against models that do.
+    """
+    return _FENCE_RE.sub("", text)
+
+
+_BATCH_DONE_STATES = {
+    types.JobState.JOB_STATE_SUCCEEDED,
+    types.JobState.JOB_STATE_FAILED,
+    types.JobState.JOB_STATE_CANCELLED,
+    types.JobState.JOB_STATE_EXPIRED,
+    types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+}
+
+
+def _parse_inlined(item: types.InlinedResponse) -> Optional[IssueMetadata]:
+    """Validate one Batch API response; None if it errored or is not valid metadata."""
+    if item.error or not item.response or not item.response.text:
+        return None
+    try:
+        return IssueMetadata.model_validate_json(_strip_fences(item.response.text))
+    except ValidationError:
+        return None
+
 
 def _fallback_extract(text: str) -> IssueMetadata:
     """
@@ -72,51 +154,74 @@ class ExtractorService:
         self.cache = CacheManager() if use_cache else None
         self.breaker = CircuitBreaker(failure_threshold=5, recovery_seconds=60.0)
 
-    def _build_prompt(self, text: str) -> str:
-        return f"""You are a technical screener for an Open Source Project.
-Your job is to analyze the GitHub Issue below and extract structured metadata for two audiences:
-1. MAINTAINERS: Who need to know if it's a critical crash or security risk.
-2. CONTRIBUTORS: Who need to know if it's a "Good First Issue" (easy, clear skills).
+    def fast_path(self, title: str, body: str = "") -> Optional[IssueMetadata]:
+        """
+        Classify trivially recognisable issues (``typo:``, ``docs:``, ``chore:``
+        titles) without an LLM call. Returns None when the LLM is needed.
+        Confidence is kept below the auto-label gate so the rules engine still
+        routes the result to a human.
+        """
+        match = _FAST_PATH_TITLE.match(title)
+        if not match:
+            return None
+        text = f"{title}\n{body}"
+        if _CRASH_PATTERNS.search(text) or _SECURITY_PATTERNS.search(text):
+            return None
+        return IssueMetadata(
+            has_reproduction_steps=False,
+            has_stacktrace=False,
+            has_logs=False,
+            is_crash=False,
+            is_security_issue=False,
+            is_blocker=False,
+            operating_system=None,
+            environment="unknown",
+            summary=title.strip()[:200],
+            difficulty="easy",
+            required_skills=[],
+            primary_area="unknown" if match.group(1).lower() == "chore" else "documentation",
+            verification_hint=None,
+            related_closed_issue_id=None,
+            extraction_confidence=0.6,
+            extraction_mode="heuristic",
+        )
 
-STRICT INSTRUCTIONS:
-1. Output ONLY valid JSON.
-2. For 'difficulty':
-   - "easy": Typos, documentation, simple CSS/Text changes.
-   - "medium": isolated bug fix, single function change.
-   - "hard": Architectural change, race conditions, core logic.
-3. For 'required_skills': specific languages or tools (e.g. "python", "react", "sql"). Lowercase only.
-4. For 'summary': A single, simple sentence describing the goal.
+    def _build_prompt(self, text: str) -> str:
+        return _EXTRACTION_PROMPT_PREFIX + text[:10000] + "\n"
 
-SCHEMA REFERENCE:
-- has_reproduction_steps, has_stacktrace, has_logs (bool)
-- is_crash, is_security_issue, is_blocker (bool)
-- operating_system (str|null), environment (str)
-- summary (str): Non-technical summary.
-- difficulty (str): "easy", "medium", "hard", "unknown"
-- required_skills (List[str]): e.g. ["python", "docker"]
-- primary_area (str): "frontend", "backend" etc.
-- verification_hint (str|null): A single shell command to verify the fix. Infer from file paths/stacktrace.
-- extraction_confidence (float): 0.0 to 1.0
+    def _build_batch_prompt(self, texts: List[str]) -> str:
+        sections = "\n".join(
+            f"[[ISSUE {i}]]\n{text[:_BATCH_ISSUE_CHARS]}\n" for i, text in enumerate(texts, 1)
+        )
+        return f"""You are a technical screener for an Open Source Project.
+Your job is to analyze each GitHub Issue below and extract structured metadata for two audiences:
+{_EXTRACTION_GUIDE}
+BATCH OUTPUT:
+Output ONLY a JSON array with exactly {len(texts)} objects, one per issue, in the same order as the [[ISSUE n]] sections.
 
-ISSUE TEXT:
-{text[:10000]}
-"""
+{sections}"""
 
-    async def extract(self, text: str) -> IssueMetadata:
-        """Extract metadata from issue text. Retries once on JSON failure."""
+    async def extract(self, text: CacheText) -> IssueMetadata:
+        """
+        Extract metadata from issue text. Retries once on JSON failure.
+        `text` may be the parts of the issue (title, body, comments...); they are
+        hashed separately for the cache and only joined once, for the prompt.
+        """
         if self.cache:
             cached = self.cache.get(text)
             if cached:
                 logger.info("Cache hit — skipping LLM call.")
                 return cached
 
+        key = text
+        if not isinstance(text, str):
+            text = "\n".join(_as_parts(text))
         prompt = self._build_prompt(text)
 
         try:
             result = await self.breaker.call(self._generate_and_parse, prompt)
             if self.cache:
-                self.cache.set(text, result)
-                self.cache.save()
+                self.cache.set(key, result)
             return result
         except CircuitOpenError as e:
             logger.warning(f"LLM circuit open — using fallback extractor: {e}")
@@ -133,51 +238,198 @@ ISSUE TEXT:
                 # Last-resort: degrade rather than fail the Action entirely.
                 return _fallback_extract(text)
 
+    async def extract_batch(self, texts: Sequence[CacheText]) -> List[Optional[IssueMetadata]]:
+        """
+        Extract metadata for several issues with one LLM call. Cache hits are
+        served first; the misses share a single prompt. If the batched call
+        fails or returns the wrong number of objects, each miss falls back to
+        extract() individually. Results are aligned with `texts` (None where an
+        issue could not be extracted).
+
+        Batched prompts only see the first _BATCH_ISSUE_CHARS of each issue, so
+        their results are cached apart from extract()'s: a later single
+        extraction still reads the full text.
+        """
+        results: List[Optional[IssueMetadata]] = [
+            (self.cache.get(text) or self.cache.get(text, kind=_BATCH_CACHE_KIND)) if self.cache else None
+            for text in texts
+        ]
+        misses = [i for i, cached in enumerate(results) if cached is None]
+        if len(misses) == 1:
+            results[misses[0]] = await self.extract(texts[misses[0]])
+        elif misses:
+            joined = [
+                t if isinstance(t, str) else "\n".join(_as_parts(t))
+                for t in (texts[i] for i in misses)
+            ]
+            try:
+                batch = await self.breaker.call(
+                    self._generate_and_parse_batch, self._build_batch_prompt(joined), len(misses)
+                )
+            except Exception as e:
+                logger.warning(f"Batched extraction failed ({e}); extracting individually.")
+                batch = await self.extract_many([texts[i] for i in misses])
+            else:
+                if self.cache:
+                    for i, meta in zip(misses, batch):
+                        self.cache.set(texts[i], meta, kind=_BATCH_CACHE_KIND)
+            for i, meta in zip(misses, batch):
+                results[i] = meta
+        return results
+
+    async def extract_many(self, texts: Sequence[CacheText], concurrency: int = 8) -> List[IssueMetadata]:
+        """
+        Run extract() for each text concurrently, with at most `concurrency`
+        LLM requests in flight. Results are in the order of `texts`.
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(text: CacheText) -> IssueMetadata:
+            async with sem:
+                return await self.extract(text)
+
+        return list(await asyncio.gather(*(one(t) for t in texts)))
+
+    async def extract_offline(
+        self,
+        texts: Sequence[CacheText],
+        poll_interval: float = 30.0,
+        timeout: float = 3600.0,
+        on_poll: Optional[Callable[[str], None]] = None,
+    ) -> List[IssueMetadata]:
+        """
+        Extract metadata through the Gemini Batch API: one job with one inlined
+        request per cache miss, polled until it finishes. Batch jobs are billed
+        at a discount but may take minutes to complete, so this is only meant
+        for offline runs (e.g. the job board). Requests the job could not
+        answer are retried through extract(). Results are in the order of `texts`.
+
+        Raises TimeoutError if the job is still pending after `timeout` seconds.
+        If polling fails or is interrupted, the remote job is cancelled before
+        the error propagates, so a caller's fallback never pays for it twice.
+        `on_poll` receives a one-line status message before each wait.
+        """
+        results: List[Optional[IssueMetadata]] = [
+            self.cache.get(text) if self.cache else None for text in texts
+        ]
+        misses = [i for i, cached in enumerate(results) if cached is None]
+        if not misses:
+            return [meta for meta in results if meta is not None]
+
+        requests = [
+            types.InlinedRequest(
+                contents=self._build_prompt(t if isinstance(t, str) else "\n".join(_as_parts(t))),
+                config=_JSON_CONFIG,
+            )
+            for t in (texts[i] for i in misses)
+        ]
+        job = await self.client.aio.batches.create(model=self.model, src=requests)
+        started = time.monotonic()
+        try:
+            while job.state not in _BATCH_DONE_STATES:
+                elapsed = time.monotonic() - started
+                if elapsed >= timeout:
+                    raise TimeoutError(f"Batch job {job.name} still {job.state} after {timeout:.0f}s")
+                if on_poll:
+                    on_poll(f"Batch job {job.name}: {job.state} ({elapsed:.0f}s elapsed)")
+                await asyncio.sleep(min(poll_interval, timeout - elapsed))
+                job = await self.client.aio.batches.get(name=job.name or "")
+        except BaseException:
+            # Also on cancellation (Ctrl-C): don't leave the job running and billing.
+            await self._cancel_batch_job(job.name or "")
+            raise
+        if job.state != types.JobState.JOB_STATE_SUCCEEDED:
+            logger.warning(f"Batch job {job.name} ended in {job.state}; extracting individually.")
+
+        responses = (job.dest.inlined_responses if job.dest else None) or []
+        retry = []
+        for n, i in enumerate(misses):
+            meta = _parse_inlined(responses[n]) if n < len(responses) else None
+            if meta is None:
+                retry.append(i)
+                continue
+            results[i] = meta
+            if self.cache:
+                self.cache.set(texts[i], meta)
+        if retry:
+            for i, meta in zip(retry, await self.extract_many([texts[i] for i in retry])):
+                results[i] = meta
+        return [meta for meta in results if meta is not None]
+
+    async def _cancel_batch_job(self, name: str) -> None:
+        try:
+            await self.client.aio.batches.cancel(name=name)
+            logger.info(f"Cancelled batch job {name}.")
+        except Exception as e:
+            logger.warning(f"Could not cancel batch job {name}: {e}")
+
+    async def _generate_and_parse_batch(self, prompt: str, expected: int) -> List[IssueMetadata]:
+        response = await self.client.aio.models.generate_content(
+            model=self.model,
+            contents=prompt,
+            config=_JSON_CONFIG,
+        )
+        if not response.text:
+            raise ValueError("Empty response from LLM")
+
+        clean_json = _strip_fences(response.text)
+        try:
+            batch = _METADATA_LIST.validate_json(clean_json)
+        except ValidationError as e:
+            raise ValueError(f"Batch validation failed: {e}") from e
+        if len(batch) != expected:
+            raise ValueError(f"Expected {expected} results, got {len(batch)}")
+        return batch
+
     async def _generate_and_parse(self, prompt: str) -> IssueMetadata:
         response = await self.client.aio.models.generate_content(
             model=self.model,
             contents=prompt,
-            config=types.GenerateContentConfig(temperature=0.0),
+            config=_JSON_CONFIG,
         )
 
         if not response.text:
             raise ValueError("Empty response from LLM")
 
-        clean_json = response.text.replace("```json", "").replace("```", "").strip()
+        clean_json = _strip_fences(response.text)
 
+        # Parse and validate in one pass (pydantic-core's JSON parser).
         try:
-            data = json.loads(clean_json)
-            return IssueMetadata(**data)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON: {e}") from e
+            return IssueMetadata.model_validate_json(clean_json)
         except ValidationError as e:
+            if any(err["type"] == "json_invalid" for err in e.errors()):
+                raise ValueError(f"Invalid JSON: {e}") from e
             raise ValueError(f"Schema validation failed: {e}") from e
 
     async def generate_search_keywords(self, text: str) -> str:
         """Extract high-signal keywords for GitHub Search."""
-        prompt = f"""You are a search query optimizer.
-Extract 3-5 unique technical keywords from the issue below to find duplicates.
-PRIORITY:
-1. Hex codes, Error Constants, Exception Names.
-2. Distinctive terms (deadlock, race condition).
-3. EXCLUDE generic words (bug, error, help, crash).
-
-Output ONLY the space-separated keywords string.
+        if self.cache:
+            cached = self.cache.get_keywords(text)
+            if cached:
+                return cached
 
-ISSUE:
-{text[:2000]}
-"""
+        prompt = _KEYWORDS_PROMPT_PREFIX + text[:2000] + "\n"
         response = await self.client.aio.models.generate_content(
             model=self.model,
             contents=prompt,
         )
-        return (response.text or "").strip().replace('"', '')
+        keywords = (response.text or "").strip().replace('"', '')
+        if self.cache and keywords:
+            self.cache.set_keywords(text, keywords)
+        return keywords
 
     async def find_semantic_duplicate(self, new_issue_text: str, candidates: list) -> DuplicateResult:
         """Compare new issue against candidates to find semantic match."""
         if not candidates:
             return DuplicateResult(duplicate_number=None, matched_issue_state=None, confidence=0.0, reasoning="No candidates found.")
 
+        candidate_numbers = [c['number'] for c in candidates]
+        if self.cache:
+            cached = self.cache.get_dupe_result(new_issue_text, candidate_numbers)
+            if cached:
+                logger.info("Cache hit — skipping duplicate verification LLM call.")
+                return cached
+
         candidates_text = "\n".join([
             f"Candidate #{c['number']} ({c['state']}): {c['title']}\n{c['body_snippet']}..."
             for c in candidates
@@ -208,9 +460,14 @@ CANDIDATES:
             response = await self.client.aio.models.generate_content(
                 model=self.model,
                 contents=prompt,
+                config=types.GenerateContentConfig(response_mime_type="application/json"),
             )
-            clean = (response.text or "").replace("```json", "").replace("```", "").strip()
-            data = json.loads(clean)
-            return DuplicateResult(**data)
+            clean = _strip_fences(response.text or "")
+            result = DuplicateResult.model_validate_json(clean)
         except Exception:
             return DuplicateResult(duplicate_number=None, matched_issue_state=None, confidence=0.0, reasoning="Analysis failed.")
+
+        # Only successful verdicts are cached; failures should be retried next run.
+        if self.cache:
+            self.cache.set_dupe_result(new_issue_text, candidate_numbers, result)
+        return result
@@ -1,10 +1,12 @@
 import asyncio
 import logging
+import re
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import quote
 
 import httpx
+from pydantic_core import from_json
 
 from app.core.rate_limiter import TokenBucket
 
@@ -14,6 +16,46 @@ logger = logging.getLogger(__name__)
 # Conservative bucket: 1 token capacity, refills at 1/sec.
 _MUTATION_BUCKET = TokenBucket(rate=1.0, capacity=1.0)
 
+# https://github.com/owner/repo[.git][/], git@github.com:owner/repo.git, github.com/owner/repo
+_GITHUB_URL_RE = re.compile(
+    r"^(?:https?://|git@)?(?:www\.)?github\.com[:/](?P<owner>[^/\s]+)/(?P<repo>[^/\s]+?)(?:\.git)?/?$"
+)
+
+# One request (and one rate-limit point) for a page of issues, instead of the
+# REST Search API's 30 req/min budget.
+_ISSUES_QUERY = """
+query($owner: String!, $repo: String!, $first: Int!, $states: [IssueState!]) {
+  repository(owner: $owner, name: $repo) {
+    issues(first: $first, states: $states, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      nodes {
+        number
+        title
+        body
+        url
+        state
+        createdAt
+        updatedAt
+        author { login }
+        labels(first: 20) { nodes { name } }
+        reactionGroups { content reactors { totalCount } }
+      }
+    }
+  }
+}
+"""
+_GRAPHQL_STATES = {"open": ["OPEN"], "closed": ["CLOSED"]}
+# GraphQL reaction enum -> REST `reactions` keys.
+_REACTION_KEYS = {
+    "THUMBS_UP": "+1",
+    "THUMBS_DOWN": "-1",
+    "LAUGH": "laugh",
+    "HOORAY": "hooray",
+    "CONFUSED": "confused",
+    "HEART": "heart",
+    "ROCKET": "rocket",
+    "EYES": "eyes",
+}
+
 
 @dataclass
 class GitHubIssue:
@@ -53,6 +95,68 @@ class GitHubService:
         self.max_retries = max_retries
         self.base_url = "https://api.github.com"
         self.headers = self._build_headers()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        # URL -> (ETag, parsed body) for conditional GETs.
+        self._etags: Dict[str, Tuple[str, Any]] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Shared client for the running event loop, created on first use.
+        Keeping one client per loop reuses keep-alive connections (and the TLS
+        session) to api.github.com across every call in a CLI invocation.
+        A client bound to an earlier loop is dropped and replaced: its
+        connections belong to that loop and cannot be closed from this one,
+        which is why callers should aclose() before their loop ends.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is not None and not self._client.is_closed and self._client_loop is not loop:
+            logger.warning("Dropping a GitHub client left open by a previous event loop.")
+            self._client = None
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def _conditional_get(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[httpx.Response, Any]:
+        """
+        GET with If-None-Match when the URL was fetched before. A 304 reuses
+        the previously parsed body and does not count against the primary
+        rate limit. Returns (response, parsed body); the body is None for
+        error responses, so callers must test the body rather than call
+        raise_for_status() (httpx raises on a 304 too).
+        """
+        key = str(httpx.URL(url, params=params))
+        cached = self._etags.get(key)
+        headers = {"If-None-Match": cached[0]} if cached else None
+
+        response = await client.get(url, params=params, headers=headers)
+        if response.status_code == 304 and cached:
+            return response, cached[1]
+        if not 200 <= response.status_code < 300:
+            return response, None
+
+        body = from_json(response.content)
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etags[key] = (etag, body)
+        return response, body
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client, if one was opened."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
 
     def _build_headers(self) -> Dict[str, str]:
         """Build request headers with authentication."""
@@ -77,23 +181,11 @@ class GitHubService:
         Raises:
             ValueError: If URL format is invalid
         """
-        try:
-            # Handle various URL formats
-            url = url.strip().rstrip('/')
-
-            # Extract from https://github.com/owner/repo
-            if "github.com" in url:
-                parts = url.split('/')
-                if len(parts) >= 2:
-                    owner = parts[-2]
-                    repo = parts[-1].replace('.git', '')
-                    if owner and repo:
-                        return owner, repo
-
-            raise ValueError(f"Invalid GitHub URL format: {url}")
-        except Exception as e:
-            logger.error(f"Error parsing GitHub URL: {e}")
-            raise ValueError(f"Invalid GitHub URL: {url}") from e
+        match = _GITHUB_URL_RE.match(url.strip())
+        if not match:
+            logger.error(f"Error parsing GitHub URL: {url}")
+            raise ValueError(f"Invalid GitHub URL: {url}")
+        return match["owner"], match["repo"]
 
     async def fetch_issue(
         self,
@@ -115,59 +207,58 @@ class GitHubService:
         Raises:
             Exception: If API request fails
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                # Fetch issue
-                issue_url = (
-                    f"{self.base_url}/repos/{owner}/{repo}/issues/{issue_number}"
-                )
-                issue_response = await client.get(
-                    issue_url,
-                    headers=self.headers
-                )
+        client = self._get_client()
+        try:
+            # Fetch issue
+            issue_url = (
+                f"{self.base_url}/repos/{owner}/{repo}/issues/{issue_number}"
+            )
+            # Issue and comments are independent endpoints — fetch them
+            # concurrently. _fetch_comments never raises, so an issue error
+            # surfaces below without cancelling the comments request.
+            (issue_response, issue_data), comments = await asyncio.gather(
+                self._conditional_get(client, issue_url),
+                self._fetch_comments(client, owner, repo, issue_number),
+            )
+            if issue_data is None:
+                # Only error responses lack a body; a 304 carries the cached one.
                 issue_response.raise_for_status()
-                issue_data = issue_response.json()
-
-                # Fetch comments
-                comments = await self._fetch_comments(
-                    client, owner, repo, issue_number
-                )
-
-                # Check rate limit
-                rate_limit = issue_response.headers.get("X-RateLimit-Remaining")
-                if rate_limit:
-                    logger.info(f"GitHub API rate limit remaining: {rate_limit}")
-
-                return GitHubIssue(
-                    number=issue_data.get("number", 0),
-                    title=issue_data.get("title", ""),
-                    body=issue_data.get("body", ""),
-                    comments=comments,
-                    url=issue_data.get("html_url", ""),
-                    state=issue_data.get("state", ""),
-                    labels=[label["name"] for label in issue_data.get("labels", [])],
-                    created_at=issue_data.get("created_at", ""),
-                    updated_at=issue_data.get("updated_at", ""),
-                    author=issue_data.get("user", {}).get("login", ""),
-                    reactions=issue_data.get("reactions", {})
-                )
-
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 404:
-                    raise ValueError(f"Issue #{issue_number} not found in {owner}/{repo}")
-                elif e.response.status_code == 403:
-                    msg = "GitHub API rate limit exceeded."
-                    if not self.github_token:
-                        msg += " Add a GITHUB_TOKEN to .env to increase limits."
-                    raise ValueError(msg)
-                else:
-                    logger.error(f"GitHub API error: {e}")
-                    raise
 
-            except Exception as e:
-                logger.error(f"Error fetching GitHub issue: {e}")
+            # Check rate limit
+            rate_limit = issue_response.headers.get("X-RateLimit-Remaining")
+            if rate_limit:
+                logger.info(f"GitHub API rate limit remaining: {rate_limit}")
+
+            return GitHubIssue(
+                number=issue_data.get("number", 0),
+                title=issue_data.get("title", ""),
+                body=issue_data.get("body", ""),
+                comments=comments,
+                url=issue_data.get("html_url", ""),
+                state=issue_data.get("state", ""),
+                labels=[label["name"] for label in issue_data.get("labels", [])],
+                created_at=issue_data.get("created_at", ""),
+                updated_at=issue_data.get("updated_at", ""),
+                author=issue_data.get("user", {}).get("login", ""),
+                reactions=issue_data.get("reactions", {})
+            )
+
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                raise ValueError(f"Issue #{issue_number} not found in {owner}/{repo}")
+            elif e.response.status_code == 403:
+                msg = "GitHub API rate limit exceeded."
+                if not self.github_token:
+                    msg += " Add a GITHUB_TOKEN to .env to increase limits."
+                raise ValueError(msg)
+            else:
+                logger.error(f"GitHub API error: {e}")
                 raise
 
+        except Exception as e:
+            logger.error(f"Error fetching GitHub issue: {e}")
+            raise
+
     async def _fetch_comments(
         self,
         client: httpx.AsyncClient,
@@ -193,13 +284,13 @@ class GitHubService:
             comments_url = (
                 f"{self.base_url}/repos/{owner}/{repo}/issues/{issue_number}/comments"
             )
-            comments_response = await client.get(
+            comments_response, comments_data = await self._conditional_get(
+                client,
                 comments_url,
-                headers=self.headers,
                 params={"per_page": max_comments}
             )
-            comments_response.raise_for_status()
-            comments_data = comments_response.json()
+            if comments_data is None:
+                comments_response.raise_for_status()
 
             # Extract comment bodies
             comments = [
@@ -223,13 +314,10 @@ class GitHubService:
             Rate limit information
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/rate_limit",
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                return response.json()
+            client = self._get_client()
+            response = await client.get(f"{self.base_url}/rate_limit")
+            response.raise_for_status()
+            return from_json(response.content)
         except Exception as e:
             logger.error(f"Error fetching rate limit: {e}")
             return {}
@@ -250,12 +338,9 @@ class GitHubService:
             True if repository exists and is accessible
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/repos/{owner}/{repo}",
-                    headers=self.headers
-                )
-                return response.status_code == 200
+            client = self._get_client()
+            response = await client.get(f"{self.base_url}/repos/{owner}/{repo}")
+            return response.status_code == 200
         except Exception:
             return False
 
@@ -267,19 +352,18 @@ class GitHubService:
         url = f"{self.base_url}/repos/{owner}/{repo}/issues/{issue_number}/labels"
 
         await _MUTATION_BUCKET.acquire()
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.post(
-                    url,
-                    headers=self.headers,
-                    json={"labels": labels}
-                )
-                response.raise_for_status()
-                logger.info(f"Applied labels {labels} to {owner}/{repo}#{issue_number}")
-                return True
-            except Exception as e:
-                logger.error(f"Failed to apply labels: {e}")
-                return False
+        client = self._get_client()
+        try:
+            response = await client.post(
+                url,
+                json={"labels": labels}
+            )
+            response.raise_for_status()
+            logger.info(f"Applied labels {labels} to {owner}/{repo}#{issue_number}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to apply labels: {e}")
+            return False
 
     async def remove_label(
         self,
@@ -298,17 +382,17 @@ class GitHubService:
             f"/labels/{encoded}"
         )
         await _MUTATION_BUCKET.acquire()
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                resp = await client.delete(url, headers=self.headers)
-                if resp.status_code == 404:
-                    return True
-                resp.raise_for_status()
-                logger.info(f"Removed label {label!r} from {owner}/{repo}#{issue_number}")
+        client = self._get_client()
+        try:
+            resp = await client.delete(url)
+            if resp.status_code == 404:
                 return True
-            except Exception as e:
-                logger.error(f"Failed to remove label {label!r}: {e}")
-                return False
+            resp.raise_for_status()
+            logger.info(f"Removed label {label!r} from {owner}/{repo}#{issue_number}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to remove label {label!r}: {e}")
+            return False
 
     async def sync_labels(
         self,
@@ -343,58 +427,112 @@ class GitHubService:
             ok = await self.remove_label(owner, repo, issue_number, label) and ok
         return ok
 
+    async def _graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        POST a GraphQL query and return its `data`. Raises on HTTP errors and
+        on GraphQL-level `errors`. GraphQL requires an authenticated token.
+        """
+        client = self._get_client()
+        response = await client.post(
+            f"{self.base_url}/graphql",
+            json={"query": query, "variables": variables},
+        )
+        response.raise_for_status()
+        payload = from_json(response.content)
+        if payload.get("errors"):
+            raise ValueError(f"GraphQL errors: {payload['errors']}")
+        return payload["data"]
+
     async def fetch_issues(self, owner: str, repo: str, state: str = "open", limit: int = 10) -> List[GitHubIssue]:
+        """
+        Fetch multiple issues (PRs excluded). With a token this is a single
+        GraphQL request; otherwise, or if GraphQL fails, the REST Search API.
+        """
+        if self.github_token:
+            try:
+                return await self._fetch_issues_graphql(owner, repo, state, limit)
+            except Exception as e:
+                logger.warning(f"GraphQL issue fetch failed ({e}); falling back to REST search.")
+        return await self._fetch_issues_rest(owner, repo, state, limit)
+
+    async def _fetch_issues_graphql(self, owner: str, repo: str, state: str, limit: int) -> List[GitHubIssue]:
+        states = _GRAPHQL_STATES.get(state, ["OPEN", "CLOSED"])
+        data = await self._graphql(
+            _ISSUES_QUERY,
+            {"owner": owner, "repo": repo, "first": min(limit, 100), "states": states},
+        )
+        nodes = ((data.get("repository") or {}).get("issues") or {}).get("nodes") or []
+        return [
+            GitHubIssue(
+                number=node.get("number", 0),
+                title=node.get("title", ""),
+                body=node.get("body", ""),
+                comments=[],
+                url=node.get("url", ""),
+                state=(node.get("state") or "").lower(),
+                labels=[lbl["name"] for lbl in (node.get("labels") or {}).get("nodes", [])],
+                created_at=node.get("createdAt", ""),
+                updated_at=node.get("updatedAt", ""),
+                author=(node.get("author") or {}).get("login", ""),
+                reactions={
+                    _REACTION_KEYS.get(group["content"], group["content"].lower()): group["reactors"]["totalCount"]
+                    for group in node.get("reactionGroups") or []
+                },
+            )
+            for node in nodes
+        ]
+
+    async def _fetch_issues_rest(self, owner: str, repo: str, state: str, limit: int) -> List[GitHubIssue]:
         """Fetch multiple issues using Search API to exclude PRs."""
         url = f"{self.base_url}/search/issues"
         query = f"repo:{owner}/{repo} is:issue state:{state}"
         params: dict[str, str] = {"q": query, "per_page": str(limit)}
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.get(url, headers=self.headers, params=params)
-                response.raise_for_status()
-
-                data = response.json()
-                items = data.get("items", [])
-
-                issues = []
-                for item in items:
-                    issues.append(GitHubIssue(
-                        number=item.get("number", 0),
-                        title=item.get("title", ""),
-                        body=item.get("body", ""),
-                        comments=[],
-                        url=item.get("html_url", ""),
-                        state=item.get("state", ""),
-                        labels=[lbl["name"] for lbl in item.get("labels", [])],
-                        created_at=item.get("created_at", ""),
-                        updated_at=item.get("updated_at", ""),
-                        author=item.get("user", {}).get("login", ""),
-                        reactions=item.get("reactions", {})
-                    ))
-                return issues
-            except Exception as e:
-                logger.error(f"Failed to fetch issues: {e}")
-                return []
+        client = self._get_client()
+        try:
+            response = await client.get(url, params=params)
+            response.raise_for_status()
+
+            data = from_json(response.content)
+            items = data.get("items", [])
+
+            issues = []
+            for item in items:
+                issues.append(GitHubIssue(
+                    number=item.get("number", 0),
+                    title=item.get("title", ""),
+                    body=item.get("body", ""),
+                    comments=[],
+                    url=item.get("html_url", ""),
+                    state=item.get("state", ""),
+                    labels=[lbl["name"] for lbl in item.get("labels", [])],
+                    created_at=item.get("created_at", ""),
+                    updated_at=item.get("updated_at", ""),
+                    author=item.get("user", {}).get("login", ""),
+                    reactions=item.get("reactions", {})
+                ))
+            return issues
+        except Exception as e:
+            logger.error(f"Failed to fetch issues: {e}")
+            return []
 
     async def post_comment(self, owner: str, repo: str, issue_number: int, body: str) -> bool:
         """Post a comment on an issue."""
         url = f"{self.base_url}/repos/{owner}/{repo}/issues/{issue_number}/comments"
 
         await _MUTATION_BUCKET.acquire()
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.post(
-                    url,
-                    headers=self.headers,
-                    json={"body": body}
-                )
-                response.raise_for_status()
-                logger.info(f"Posted comment on {owner}/{repo}#{issue_number}")
-                return True
-            except Exception as e:
-                logger.error(f"Failed to post comment: {e}")
-                return False
+        client = self._get_client()
+        try:
+            response = await client.post(
+                url,
+                json={"body": body}
+            )
+            response.raise_for_status()
+            logger.info(f"Posted comment on {owner}/{repo}#{issue_number}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to post comment: {e}")
+            return False
 
     async def find_comment_by_marker(
         self,
@@ -411,17 +549,17 @@ class GitHubService:
         """
         url = f"{self.base_url}/repos/{owner}/{repo}/issues/{issue_number}/comments"
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                resp = await client.get(url, headers=self.headers, params={"per_page": 100})
-                resp.raise_for_status()
-                for comment in resp.json():
-                    if marker in (comment.get("body") or ""):
-                        return int(comment["id"])
-                return None
-            except Exception as e:
-                logger.warning(f"find_comment_by_marker failed: {e}")
-                return None
+        client = self._get_client()
+        try:
+            resp = await client.get(url, params={"per_page": 100})
+            resp.raise_for_status()
+            for comment in from_json(resp.content):
+                if marker in (comment.get("body") or ""):
+                    return int(comment["id"])
+            return None
+        except Exception as e:
+            logger.warning(f"find_comment_by_marker failed: {e}")
+            return None
 
     async def update_comment(
         self,
@@ -434,15 +572,15 @@ class GitHubService:
         url = f"{self.base_url}/repos/{owner}/{repo}/issues/comments/{comment_id}"
 
         await _MUTATION_BUCKET.acquire()
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                resp = await client.patch(url, headers=self.headers, json={"body": body})
-                resp.raise_for_status()
-                logger.info(f"Updated comment {comment_id} on {owner}/{repo}")
-                return True
-            except Exception as e:
-                logger.error(f"Failed to update comment {comment_id}: {e}")
-                return False
+        client = self._get_client()
+        try:
+            resp = await client.patch(url, json={"body": body})
+            resp.raise_for_status()
+            logger.info(f"Updated comment {comment_id} on {owner}/{repo}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to update comment {comment_id}: {e}")
+            return False
 
     async def upsert_comment(
         self,
@@ -470,39 +608,39 @@ class GitHubService:
         Retries on rate limit (429/403) with exponential backoff.
         """
         query = f"repo:{owner}/{repo} is:issue sort:relevance {keywords}"
-        encoded_query = quote(query)
-        url = f"{self.base_url}/search/issues?q={encoded_query}&per_page={limit}"
-
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            for attempt in range(self.max_retries):
-                try:
-                    response = await client.get(url, headers=self.headers)
-
-                    if response.status_code in (429, 403):
-                        retry_after = int(response.headers.get("Retry-After", 2 ** attempt))
-                        logger.warning(f"Rate limited (attempt {attempt + 1}). Retrying in {retry_after}s.")
-                        await asyncio.sleep(retry_after)
-                        continue
-
-                    if response.status_code == 200:
-                        items = response.json().get("items", [])
-                        return [
-                            {
-                                "number": item["number"],
-                                "title": item["title"],
-                                "state": item["state"],
-                                "body_snippet": (item.get("body") or "")[:500],
-                            }
-                            for item in items
-                        ]
-
-                    logger.error(f"Search failed ({response.status_code}): {response.text}")
-                    return []
+        url = f"{self.base_url}/search/issues"
+        params = {"q": query, "per_page": limit}
 
-                except Exception as e:
-                    logger.error(f"Search error (attempt {attempt + 1}): {e}")
-                    if attempt == self.max_retries - 1:
-                        return []
-                    await asyncio.sleep(2 ** attempt)
+        client = self._get_client()
+        for attempt in range(self.max_retries):
+            try:
+                response, data = await self._conditional_get(client, url, params=params)
+
+                if response.status_code in (429, 403):
+                    retry_after = int(response.headers.get("Retry-After", 2 ** attempt))
+                    logger.warning(f"Rate limited (attempt {attempt + 1}). Retrying in {retry_after}s.")
+                    await asyncio.sleep(retry_after)
+                    continue
+
+                if data is not None:
+                    items = data.get("items", [])
+                    return [
+                        {
+                            "number": item["number"],
+                            "title": item["title"],
+                            "state": item["state"],
+                            "body_snippet": (item.get("body") or "")[:500],
+                        }
+                        for item in items
+                    ]
+
+                logger.error(f"Search failed ({response.status_code}): {response.text}")
+                return []
+
+            except Exception as e:
+                logger.error(f"Search error (attempt {attempt + 1}): {e}")
+                if attempt == self.max_retries - 1:
+                    return []
+                await asyncio.sleep(2 ** attempt)
 
         return []
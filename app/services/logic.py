@@ -1,4 +1,16 @@
-from typing import Any
+import operator as _op
+from typing import Any, Callable
+
+Predicate = Callable[[Any], Any]
+
+_COMPARATORS: dict[str, Callable[[Any, Any], Any]] = {
+    "==": _op.eq,
+    "!=": _op.ne,
+    ">": _op.gt,
+    ">=": _op.ge,
+    "<": _op.lt,
+    "<=": _op.le,
+}
 
 
 def apply(logic: Any, data: Any = None) -> Any:
@@ -11,7 +23,7 @@ def apply(logic: Any, data: Any = None) -> Any:
         return logic
 
     # Logic relies on a single key operator
-    operator = list(logic.keys())[0]
+    operator = next(iter(logic))
     values = logic[operator]
 
     # Ensure values is a list for unary/binary ops
@@ -22,49 +34,88 @@ def apply(logic: Any, data: Any = None) -> Any:
     if operator == "var":
         return get_var(data, str(values[0]) if values else "", values[1] if len(values) > 1 else None)
 
-    # Recursive evaluation
-    eval_values = [apply(v, data) for v in values]
-
-    if operator == "==":
-        return eval_values[0] == eval_values[1]
-    if operator == "!=":
-        return eval_values[0] != eval_values[1]
-    if operator == ">":
-        return eval_values[0] > eval_values[1]
-    if operator == ">=":
-        return eval_values[0] >= eval_values[1]
-    if operator == "<":
-        return eval_values[0] < eval_values[1]
-    if operator == "<=":
-        return eval_values[0] <= eval_values[1]
-
+    # Boolean operators evaluate lazily so pruned branches are never walked.
     if operator == "and":
-        return all(eval_values)
+        return all(apply(v, data) for v in values)
     if operator == "or":
-        return any(eval_values)
+        return any(apply(v, data) for v in values)
+    if operator == "!":
+        return not apply(values[0], data)
+
+    if operator in _COMPARATORS:
+        return _COMPARATORS[operator](apply(values[0], data), apply(values[1], data))
     if operator == "in":
-        needle, haystack = eval_values[0], eval_values[1]
+        needle, haystack = apply(values[0], data), apply(values[1], data)
         if isinstance(haystack, (list, str)):
             return needle in haystack
         return False
-    if operator == "!":
-        return not eval_values[0]
 
     return False
 
+def compile_logic(logic: Any) -> Predicate:
+    """
+    Compile JSON-Logic into a Python closure with the same semantics as apply().
+    The rule tree is walked once here; calling the result only runs the operators.
+    Raises (like apply) if the rule is malformed, e.g. a binary op with one operand.
+    """
+    if not isinstance(logic, dict):
+        return lambda data: logic
+
+    operator = next(iter(logic))
+    values = logic[operator]
+    if not isinstance(values, list):
+        values = [values]
+
+    if operator == "var":
+        key = str(values[0]) if values else ""
+        default = values[1] if len(values) > 1 else None
+        if not key:
+            return lambda data: data
+        # Split the (static) path once, here, instead of on every lookup.
+        parts = tuple(key.split("."))
+        if len(parts) == 1:
+            return lambda data: data.get(key, default) if isinstance(data, dict) else default
+        return lambda data: _walk(data, parts, default)
+
+    args = [compile_logic(v) for v in values]
+
+    if operator in _COMPARATORS:
+        compare = _COMPARATORS[operator]
+        left, right = args[0], args[1]
+        return lambda data: compare(left(data), right(data))
+
+    if operator == "and":
+        return lambda data: all(arg(data) for arg in args)
+    if operator == "or":
+        return lambda data: any(arg(data) for arg in args)
+    if operator == "in":
+        needle_fn, haystack_fn = args[0], args[1]
+
+        def _in(data: Any) -> bool:
+            needle, haystack = needle_fn(data), haystack_fn(data)
+            if isinstance(haystack, (list, str)):
+                return needle in haystack
+            return False
+
+        return _in
+    if operator == "!":
+        operand = args[0]
+        return lambda data: not operand(data)
+
+    return lambda data: False
+
+
+def _walk(data: Any, parts: tuple[str, ...], default: Any) -> Any:
+    current = data
+    for part in parts:
+        if not isinstance(current, dict):
+            return default
+        current = current.get(part, default)
+    return current
+
+
 def get_var(data: Any, key: str, default: Any = None) -> Any:
     """Retrieve variable from data."""
     if key is None or key == "":
         return data
-
-    try:
-        parts = str(key).split(".")
-        current = data
-        for part in parts:
-            if isinstance(current, dict):
-                current = current.get(part, default)
-            else:
-                return default
-        return current
-    except Exception:
-        return default
+    return _walk(data, tuple(str(key).split(".")), default)
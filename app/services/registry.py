@@ -0,0 +1,30 @@
+"""
+Process-wide service singletons.
+
+Same pattern as `get_settings()`: `@lru_cache` makes each factory return one
+shared instance, so commands invoked in the same process reuse parsed rules,
+the Gemini client and the GitHub HTTP client instead of rebuilding them.
+"""
+
+from functools import lru_cache
+
+from app.core.config import settings
+from app.services.extractor import ExtractorService
+from app.services.github_service import GitHubService
+from app.services.triage import TriageService
+
+
+@lru_cache()
+def get_github_service() -> GitHubService:
+    return GitHubService(github_token=settings.GITHUB_TOKEN)
+
+
+@lru_cache()
+def get_extractor() -> ExtractorService:
+    # Raises ValueError without GEMINI_API_KEY; lru_cache does not cache failures.
+    return ExtractorService()
+
+
+@lru_cache()
+def get_triage(rules_path: str = "rules.yaml") -> TriageService:
+    return TriageService(rules_path)
@@ -1,8 +1,10 @@
+import gzip
 import os
 from dataclasses import dataclass
 from typing import Any, List
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from jinja2.environment import TemplateStream
 
 
 @dataclass
@@ -17,30 +19,69 @@ class Reporter:
     """Generates static HTML reports."""
 
     def __init__(self, template_dir: str = "app/templates"):
-        self.env = Environment(loader=FileSystemLoader(template_dir))
-
-    def generate_board(self, items: List[BoardItem], output_path: str = "job_board.html", site_url: str = "") -> str:
-        """Render the Job Board HTML."""
-        template = self.env.get_template("board.html")
-        html = template.render(issues=items, site_url=site_url)
-
-        with open(output_path, "w") as f:
-            f.write(html)
+        # Templates never change during a run: skip mtime checks and reuse
+        # compiled bytecode (kept in the system temp dir) across processes.
+        self.env = Environment(
+            loader=FileSystemLoader(template_dir),
+            auto_reload=False,
+            bytecode_cache=FileSystemBytecodeCache(),
+        )
+        self._board_tpl = self.env.get_template("board.html")
+        self._feed_tpl = self.env.get_template("feed.xml")
 
+    @staticmethod
+    def _write(stream: TemplateStream, output_path: str, compress: bool) -> str:
+        """
+        Stream rendered chunks to disk rather than building the whole page in
+        memory. With `compress`, the same chunks also go to `<output_path>.gz`
+        (for static hosts that serve pre-compressed files) in the same pass.
+        Output goes to temporary files next to the targets and is moved into
+        place only once rendering finishes, so a failed render leaves the
+        previously published files untouched.
+        """
+        tmp_path = f"{output_path}.tmp-{os.getpid()}"
+        tmp_gz = f"{output_path}.gz.tmp-{os.getpid()}"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as out:
+                if not compress:
+                    out.writelines(stream)
+                else:
+                    with gzip.open(tmp_gz, "wt", encoding="utf-8", compresslevel=6) as gz:
+                        for chunk in stream:
+                            out.write(chunk)
+                            gz.write(chunk)
+            if compress:
+                os.replace(tmp_gz, output_path + ".gz")
+            os.replace(tmp_path, output_path)
+        finally:
+            for leftover in (tmp_path, tmp_gz):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
         return os.path.abspath(output_path)
 
-    def generate_feed(self, items: List[BoardItem], output_path: str = "feed.xml", site_url: str = "") -> str:
+    def generate_board(
+        self,
+        items: List[BoardItem],
+        output_path: str = "job_board.html",
+        site_url: str = "",
+        compress: bool = False,
+    ) -> str:
+        """Render the Job Board HTML."""
+        return self._write(self._board_tpl.stream(issues=items, site_url=site_url), output_path, compress)
+
+    def generate_feed(
+        self,
+        items: List[BoardItem],
+        output_path: str = "feed.xml",
+        site_url: str = "",
+        compress: bool = False,
+    ) -> str:
         """Render the Atom Feed."""
         from datetime import datetime
 
-        template = self.env.get_template("feed.xml")
-        html = template.render(
+        stream = self._feed_tpl.stream(
             issues=items,
             now=datetime.utcnow().isoformat() + "Z",
             site_url=site_url
         )
-
-        with open(output_path, "w") as f:
-            f.write(html)
-
-        return os.path.abspath(output_path)
+        return self._write(stream, output_path, compress)
@@ -1,14 +1,23 @@
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 from pydantic import TypeAdapter, ValidationError
 
 from app.models.schemas import IssueMetadata, RuleDefinition, RuleResult, TriageAction
+from app.services.logic import Predicate, compile_logic
 from app.services.logic import apply as json_logic_apply
 
 logger = logging.getLogger(__name__)
 
+# libyaml's C loader parses several times faster; PyYAML without it falls back.
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def load_yaml(stream: Any) -> Any:
+    """yaml.safe_load equivalent using the C loader when available."""
+    return yaml.load(stream, Loader=_YamlLoader)
+
 _LOW_CONFIDENCE_ACTION = TriageAction(
     priority_score=3,
     labels=["triage/low-confidence"],
@@ -22,6 +31,18 @@ _DEFAULT_ACTION = TriageAction(
 )
 
 
+
+def _rule_data(metadata: IssueMetadata, context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    The dict rules are evaluated against. IssueMetadata fields are flat
+    scalars/lists, so the model's own field dict is read directly instead of
+    deep-copying it with model_dump(); a copy is made only to merge context.
+    Rules only read this data — never mutate it.
+    """
+    if context:
+        return {**metadata.__dict__, **context}
+    return metadata.__dict__
+
 class TriageService:
     """
     Deterministic Rules Engine.
@@ -31,12 +52,24 @@ class TriageService:
     def __init__(self, rules_path: str = "rules.yaml"):
         self.rules_path = rules_path
         self.rules: List[RuleDefinition] = []
+        self._compiled_rules: List[Tuple[RuleDefinition, Predicate]] = []
         self.load_rules()
 
+    @staticmethod
+    def _compile(rule: RuleDefinition) -> Predicate:
+        try:
+            return compile_logic(rule.condition)
+        except Exception as e:
+            # Keep the interpreted path so the error is reported at evaluation
+            # time, exactly as it was before rules were compiled.
+            logger.error(f"Could not compile rule '{rule.name}': {e}")
+            condition = rule.condition
+            return lambda data: json_logic_apply(condition, data)
+
     def load_rules(self) -> None:
         def _load_and_validate(path: str) -> List[RuleDefinition]:
             with open(path) as f:
-                raw_rules = yaml.safe_load(f)
+                raw_rules = load_yaml(f)
             return TypeAdapter(List[RuleDefinition]).validate_python(raw_rules)
 
         try:
@@ -54,6 +87,8 @@ class TriageService:
             else:
                 self.rules = []
 
+        self._compiled_rules = [(rule, self._compile(rule)) for rule in self.rules]
+
     def evaluate(
         self,
         metadata: IssueMetadata,
@@ -75,13 +110,11 @@ class TriageService:
             )
             return _LOW_CONFIDENCE_ACTION
 
-        data = metadata.model_dump()
-        if context:
-            data.update(context)
+        data = _rule_data(metadata, context)
 
-        for rule in self.rules:
+        for rule, predicate in self._compiled_rules:
             try:
-                if json_logic_apply(rule.condition, data):
+                if predicate(data):
                     logger.info(f"Rule matched: {rule.name}")
                     return rule.action
             except Exception as e:
@@ -89,6 +122,41 @@ class TriageService:
 
         return _DEFAULT_ACTION
 
+    def evaluate_batch(
+        self,
+        metadata: List[IssueMetadata],
+        min_confidence: float = 0.75,
+    ) -> List[TriageAction]:
+        """
+        evaluate() for several issues, rule by rule: each rule is checked against
+        the issues no earlier rule has matched, so the loop over rules runs once
+        per batch instead of once per issue. Results are in input order.
+        """
+        actions: List[TriageAction] = []
+        pending: List[Tuple[int, Dict[str, Any]]] = []
+        for i, meta in enumerate(metadata):
+            if meta.extraction_confidence < min_confidence:
+                actions.append(_LOW_CONFIDENCE_ACTION)
+            else:
+                actions.append(_DEFAULT_ACTION)
+                pending.append((i, _rule_data(meta, None)))
+
+        for rule, predicate in self._compiled_rules:
+            if not pending:
+                break
+            unmatched = []
+            for i, data in pending:
+                try:
+                    if predicate(data):
+                        actions[i] = rule.action
+                        continue
+                except Exception as e:
+                    logger.error(f"Error evaluating rule '{rule.name}': {e}")
+                unmatched.append((i, data))
+            pending = unmatched
+
+        return actions
+
     def trace(
         self,
         metadata: IssueMetadata,
@@ -106,15 +174,13 @@ class TriageService:
                 action=_LOW_CONFIDENCE_ACTION,
             )]
 
-        data = metadata.model_dump()
-        if context:
-            data.update(context)
+        data = _rule_data(metadata, context)
 
         results = []
-        for rule in self.rules:
+        for rule, predicate in self._compiled_rules:
             matched = False
             try:
-                matched = bool(json_logic_apply(rule.condition, data))
+                matched = bool(predicate(data))
             except Exception as e:
                 logger.error(f"Error checking rule '{rule.name}': {e}")
 
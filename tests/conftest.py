@@ -7,6 +7,13 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../"
 import pytest  # noqa: E402, F401 — used by fixtures
 
 from app.models.schemas import IssueMetadata  # noqa: E402
+from app.services.triage import TriageService  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def triage_service():
+    """The project rules.yaml, parsed once per run. evaluate()/trace() are read-only."""
+    return TriageService(rules_path="rules.yaml")
 
 
 @pytest.fixture
@@ -28,6 +35,26 @@ def crash_metadata():
     )
 
 
+@pytest.fixture
+def easy_doc_metadata():
+    # Trusted, hand-built input: skip validation.
+    return IssueMetadata.model_construct(
+        has_reproduction_steps=False,
+        has_stacktrace=False,
+        has_logs=False,
+        operating_system=None,
+        environment="unknown",
+        is_crash=False,
+        is_security_issue=False,
+        is_blocker=False,
+        summary="Fix typo in README",
+        difficulty="easy",
+        required_skills=["markdown"],
+        primary_area="documentation",
+        extraction_confidence=0.95,
+    )
+
+
 @pytest.fixture
 def feature_metadata():
     return IssueMetadata(
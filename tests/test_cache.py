@@ -1,9 +1,11 @@
 import json
 import os
+import sqlite3
+import time
 
 import pytest
 
-from app.models.schemas import IssueMetadata
+from app.models.schemas import DuplicateResult, IssueMetadata
 from app.services.cache import CacheManager
 
 
@@ -30,7 +32,7 @@ def _meta(**overrides) -> IssueMetadata:
 
 @pytest.fixture
 def tmp_cache_path(tmp_path):
-    return str(tmp_path / "cache.json")
+    return str(tmp_path / "cache.db")
 
 
 def test_compute_hash_is_deterministic(tmp_cache_path):
@@ -53,10 +55,10 @@ def test_get_miss_returns_none(tmp_cache_path):
     assert cache.get("never seen") is None
 
 
-def test_save_then_load_persists(tmp_cache_path):
+def test_entries_persist_across_instances(tmp_cache_path):
     cache = CacheManager(cache_path=tmp_cache_path)
     cache.set("body-1", _meta(summary="persisted"))
-    cache.save()
+    cache.close()
 
     fresh = CacheManager(cache_path=tmp_cache_path)
     retrieved = fresh.get("body-1")
@@ -64,46 +66,92 @@ def test_save_then_load_persists(tmp_cache_path):
     assert retrieved.summary == "persisted"
 
 
-def test_load_corrupt_cache_falls_back_to_empty(tmp_cache_path):
+def test_set_overwrites_existing_entry(tmp_cache_path):
+    cache = CacheManager(cache_path=tmp_cache_path)
+    cache.set("body", _meta(summary="first"))
+    cache.set("body", _meta(summary="second"))
+    assert cache.get("body").summary == "second"
+
+
+def test_whitespace_only_edits_hit_the_same_entry(tmp_cache_path):
+    cache = CacheManager(cache_path=tmp_cache_path)
+    cache.set("Title\r\n\nBody text  \n<B>bold</B>", _meta(summary="normalised"))
+    hit = cache.get("\n  Title\n\n\n\nBody text\n<b>bold</b>\n\n")
+    assert hit is not None
+    assert hit.summary == "normalised"
+
+
+def test_entries_are_namespaced_by_model(tmp_cache_path):
+    cache = CacheManager(cache_path=tmp_cache_path, namespace="model-a")
+    cache.set("body", _meta())
+    cache.close()
+
+    other_model = CacheManager(cache_path=tmp_cache_path, namespace="model-b")
+    assert other_model.get("body") is None
+
+
+def test_repeat_get_is_served_from_memory(tmp_cache_path):
+    cache = CacheManager(cache_path=tmp_cache_path)
+    cache.set("body", _meta(summary="hot"))
+    cache._conn.execute("DELETE FROM cache")  # only the LRU can answer now
+    assert cache.get("body").summary == "hot"
+
+
+def test_get_returns_independent_copies(tmp_cache_path):
+    cache = CacheManager(cache_path=tmp_cache_path)
+    cache.set("body", _meta())
+    first = cache.get("body")
+    first.related_closed_issue_id = 7
+    assert cache.get("body").related_closed_issue_id is None
+
+
+def test_memo_is_bounded(tmp_cache_path, monkeypatch):
+    monkeypatch.setattr(CacheManager, "MEMO_SIZE", 2)
+    cache = CacheManager(cache_path=tmp_cache_path)
+    for body in ("a", "b", "c"):
+        cache.set(body, _meta(summary=body))
+    assert len(cache._memo) == 2
+    # Evicted entries still come back from disk.
+    assert cache.get("a").summary == "a"
+
+
+def test_open_corrupt_cache_falls_back_to_empty(tmp_cache_path):
     with open(tmp_cache_path, "w") as f:
         f.write("{not valid json")
     cache = CacheManager(cache_path=tmp_cache_path)
-    assert cache.cache == {}
+    assert cache.get("anything") is None
+    # Still usable (in-memory) for the rest of the run.
+    cache.set("anything", _meta())
+    assert cache.get("anything") is not None
 
 
-def test_load_missing_file_starts_empty(tmp_cache_path):
+def test_open_missing_file_starts_empty(tmp_cache_path):
     assert not os.path.exists(tmp_cache_path)
     cache = CacheManager(cache_path=tmp_cache_path)
-    assert cache.cache == {}
+    assert cache.get("anything") is None
 
 
 def test_get_with_corrupt_entry_returns_none(tmp_cache_path):
     cache = CacheManager(cache_path=tmp_cache_path)
-    key = cache._compute_hash("bad")
-    cache.cache[key] = {"not": "a valid IssueMetadata"}
+    key = cache._cache_key("bad")
+    cache._conn.execute(
+        "INSERT INTO cache (kind, key, blob) VALUES ('metadata', ?, ?)",
+        (key, json.dumps({"not": "a valid IssueMetadata"})),
+    )
     assert cache.get("bad") is None
 
 
-def test_save_failure_does_not_raise(tmp_cache_path, monkeypatch):
-    cache = CacheManager(cache_path=tmp_cache_path)
-    cache.set("x", _meta())
+def test_stale_schema_version_is_rebuilt(tmp_cache_path):
+    conn = sqlite3.connect(tmp_cache_path)
+    conn.execute("CREATE TABLE cache (key TEXT PRIMARY KEY, blob TEXT NOT NULL)")
+    conn.execute("INSERT INTO cache VALUES ('k', '{}')")
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
 
-    def _boom(*_a, **_kw):
-        raise OSError("disk full")
-
-    monkeypatch.setattr("builtins.open", _boom)
-    cache.save()  # should swallow the OSError
-
-
-def test_persisted_file_is_valid_json(tmp_cache_path):
     cache = CacheManager(cache_path=tmp_cache_path)
-    cache.set("payload", _meta())
-    cache.save()
-    with open(tmp_cache_path) as f:
-        data = json.load(f)
-    # v2 envelope: {_schema_version, cache, processed_signatures}
-    assert data["_schema_version"] == CacheManager.SCHEMA_VERSION
-    assert len(data["cache"]) == 1
+    assert cache._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] == 0
+    assert cache._conn.execute("PRAGMA user_version").fetchone()[0] == CacheManager.SCHEMA_VERSION
 
 
 def test_mark_and_check_recently_processed(tmp_cache_path):
@@ -115,31 +163,70 @@ def test_mark_and_check_recently_processed(tmp_cache_path):
     assert cache.is_recently_processed("o", "r", 2, "body content") is False
 
 
-def test_processed_signature_expires_after_window(tmp_cache_path):
+def test_processed_signature_expires_after_window(tmp_cache_path, monkeypatch):
     cache = CacheManager(cache_path=tmp_cache_path)
     cache.mark_processed("o", "r", 1, "body")
-    # Backdate the timestamp by 48h
-    key = CacheManager._signature_key("o", "r", 1)
-    cache.processed_signatures[key]["ts"] -= 48 * 3600
+    # Pretend 48h have passed since the run was recorded.
+    now = time.time()
+    monkeypatch.setattr("app.services.cache.time.time", lambda: now + 48 * 3600)
 
     assert cache.is_recently_processed("o", "r", 1, "body", window_seconds=24 * 3600) is False
     assert cache.is_recently_processed("o", "r", 1, "body", window_seconds=72 * 3600) is True
 
 
-def test_processed_signatures_persist_across_load(tmp_cache_path):
+def test_processed_signatures_persist_across_instances(tmp_cache_path):
     cache = CacheManager(cache_path=tmp_cache_path)
     cache.mark_processed("o", "r", 1, "body")
-    cache.save()
+    cache.close()
 
     fresh = CacheManager(cache_path=tmp_cache_path)
     assert fresh.is_recently_processed("o", "r", 1, "body") is True
 
 
-def test_legacy_v1_cache_file_still_loads(tmp_cache_path):
-    # Pre-v1.1 file: flat dict of sha → metadata, no schema_version envelope.
-    with open(tmp_cache_path, "w") as f:
-        json.dump({"deadbeef": {}}, f)
+def test_keywords_roundtrip_and_isolated_from_metadata(tmp_cache_path):
+    cache = CacheManager(cache_path=tmp_cache_path)
+    cache.set_keywords("body", "deadlock EPIPE")
+    assert cache.get_keywords("body") == "deadlock EPIPE"
+    assert cache.get("body") is None
+    assert cache.get_keywords("other") is None
+
+
+def test_dupe_result_keyed_by_candidate_set(tmp_cache_path):
+    cache = CacheManager(cache_path=tmp_cache_path)
+    verdict = DuplicateResult(duplicate_number=5, confidence=0.9, reasoning="same trace")
+    cache.set_dupe_result("body", [7, 5], verdict)
+
+    hit = cache.get_dupe_result("body", [5, 7])  # order-insensitive
+    assert hit is not None
+    assert hit.duplicate_number == 5
+    assert cache.get_dupe_result("body", [5, 8]) is None
+
+
+def test_parts_are_hashed_without_ambiguity(tmp_cache_path):
+    cache = CacheManager(cache_path=tmp_cache_path)
+    assert cache._compute_hash("ab", "c") != cache._compute_hash("a", "bc")
+    cache.set(("title", "body", "comments"), _meta(summary="parts"))
+    assert cache.get(["title", "body", "comments"]).summary == "parts"
+    assert cache.get("title body comments") is None
+
+
+def test_processed_signature_accepts_parts(tmp_cache_path):
+    cache = CacheManager(cache_path=tmp_cache_path)
+    cache.mark_processed("o", "r", 1, ("title", "body"))
+    assert cache.is_recently_processed("o", "r", 1, ("title", "body")) is True
+    assert cache.is_recently_processed("o", "r", 1, ("title", "edited")) is False
+
+
+def test_metadata_kinds_are_separate(tmp_cache_path):
+    cache = CacheManager(cache_path=tmp_cache_path)
+    cache.set("body", _meta(summary="batched"), kind="metadata_batch")
+    assert cache.get("body") is None
+    assert cache.get("body", kind="metadata_batch").summary == "batched"
+
 
+def test_code_generics_keep_their_case(tmp_cache_path):
     cache = CacheManager(cache_path=tmp_cache_path)
-    assert cache.cache == {"deadbeef": {}}
-    assert cache.processed_signatures == {}
+    assert cache._cache_key("List<String> items") != cache._cache_key("List<string> items")
+    assert cache._cache_key("Map<Key, Value> m") != cache._cache_key("Map<key, Value> m")
+    assert cache._cache_key("if a<B then") != cache._cache_key("if a<b then")
+    assert cache._cache_key("<B>x</B> <BR/>") == cache._cache_key("<b>x</b> <br/>")
@@ -0,0 +1,30 @@
+import os
+
+from app.cli.main import _run_async
+from app.services.cache import CacheManager
+from app.services.registry import get_github_service
+
+
+def test_run_async_closes_shared_github_client():
+    svc = get_github_service()
+
+    async def use_client():
+        return svc._get_client()
+
+    client = _run_async(use_client())
+
+    assert client.is_closed
+    assert svc._client is None
+
+
+def test_run_async_closes_caches_and_checkpoints_wal(tmp_path):
+    path = tmp_path / "cache.db"
+    cache = CacheManager(cache_path=str(path))
+
+    async def write():
+        cache.set_keywords("body", "deadlock")
+
+    _run_async(write())
+
+    assert not os.path.exists(f"{path}-wal")
+    assert CacheManager(cache_path=str(path)).get_keywords("body") == "deadlock"
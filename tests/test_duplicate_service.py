@@ -1,9 +1,10 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 from app.models.schemas import DuplicateResult
-from app.services.duplicate_service import DuplicateService
+from app.services.duplicate_service import DuplicateService, _normalize_title, _signal_keywords
 
 
 def _make_services(keywords="auth crash", candidates=None, dup_result=None):
@@ -77,6 +78,110 @@ async def test_self_is_excluded_from_candidates():
     assert result.confidence == 0.0
 
 
+# ── exact title short-circuit ─────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_exact_title_match_skips_llm():
+    candidates = [{"number": 12, "title": "Login: crashes on null!", "state": "open", "body_snippet": ""}]
+    gh, extractor = _make_services(candidates=candidates)
+    svc = DuplicateService(gh, extractor)
+
+    result = await svc.check_duplicate("owner", "repo", "login crashes on NULL", "Body", 99)
+
+    assert result.duplicate_number == 12
+    assert result.matched_issue_state == "open"
+    # Below the 0.9 auto-label gate: a title alone only suggests a duplicate.
+    assert 0.7 <= result.confidence < 0.9
+    # The keyword search and semantic verification never run.
+    assert gh.search_issues.call_count == 1
+    extractor.find_semantic_duplicate.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("title", ["Bug", "Error", "Help needed", "Crash on startup"])
+async def test_short_titles_skip_exact_match(title):
+    candidates = [{"number": 12, "title": title, "state": "open", "body_snippet": ""}]
+    dup = DuplicateResult(duplicate_number=None, confidence=0.0, reasoning="Different root cause.")
+    gh, extractor = _make_services(candidates=candidates, dup_result=dup)
+    svc = DuplicateService(gh, extractor)
+
+    result = await svc.check_duplicate("owner", "repo", title, "Body", 99)
+
+    assert result.duplicate_number is None
+    # No in:title probe; the normal keyword search + LLM verification decide.
+    assert gh.search_issues.call_count == 1
+    extractor.find_semantic_duplicate.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_keywords_are_generated_during_title_probe():
+    gh, extractor = _make_services()
+    started = asyncio.Event()
+
+    async def keywords(_text):
+        started.set()
+        return "auth crash"
+
+    async def search(owner, repo, query):
+        if query.endswith("in:title"):
+            # The LLM call must already be in flight while the probe runs.
+            await asyncio.wait_for(started.wait(), timeout=1)
+        return [{"number": 5, "title": "Login crash", "state": "open", "body_snippet": ""}]
+
+    extractor.generate_search_keywords = AsyncMock(side_effect=keywords)
+    gh.search_issues = AsyncMock(side_effect=search)
+    svc = DuplicateService(gh, extractor)
+
+    result = await svc.check_duplicate("owner", "repo", "Auth crash after token refresh", "Body", 99)
+
+    assert result.duplicate_number == 5
+
+
+@pytest.mark.asyncio
+async def test_exact_title_match_ignores_self():
+    candidates = [{"number": 99, "title": "Auth crash after token refresh", "state": "open", "body_snippet": ""}]
+    gh, extractor = _make_services(candidates=candidates)
+    svc = DuplicateService(gh, extractor)
+
+    await svc.check_duplicate("owner", "repo", "Auth crash after token refresh", "Body", 99)
+
+    extractor.generate_search_keywords.assert_called_once()
+
+
+def test_normalize_title():
+    assert _normalize_title("  Fix: Crash -- on  START! ") == "fix crash on start"
+
+
+def test_signal_keywords():
+    text = "KeyError in parser\nexit code 0xC0000005, ERR_BAD_CONFIG, KeyError again"
+    assert _signal_keywords(text) == "KeyError 0xC0000005 ERR_BAD_CONFIG"
+    assert _signal_keywords("Login fails with a ValueError") == ""
+    assert _signal_keywords("GITHUB_TOKEN and DATABASE_URL unset, MAX_RETRIES=3") == ""
+    assert _signal_keywords("open failed: ENOENT, then E_FAIL") == "ENOENT E_FAIL"
+
+
+@pytest.mark.asyncio
+async def test_error_tokens_replace_llm_keywords():
+    gh, extractor = _make_services()
+    svc = DuplicateService(gh, extractor)
+
+    result = await svc.check_duplicate("owner", "repo", "Boot fails", "ECONNRESET then TimeoutError", 99)
+
+    assert result.duplicate_number == 5
+    extractor.generate_search_keywords.assert_not_called()
+    assert gh.search_issues.call_args_list[-1].args[2] == "ECONNRESET TimeoutError"
+
+
+@pytest.mark.asyncio
+async def test_env_var_names_do_not_replace_llm_keywords():
+    gh, extractor = _make_services()
+    svc = DuplicateService(gh, extractor)
+
+    await svc.check_duplicate("owner", "repo", "Boot fails", "GITHUB_TOKEN and DATABASE_URL unset, MAX_RETRIES=3", 99)
+
+    extractor.generate_search_keywords.assert_called_once()
+
+
 # ── degraded paths ────────────────────────────────────────────────────────────
 
 @pytest.mark.asyncio
@@ -84,11 +189,12 @@ async def test_returns_no_match_when_keywords_empty():
     gh, extractor = _make_services(keywords="")
     svc = DuplicateService(gh, extractor)
 
-    result = await svc.check_duplicate("owner", "repo", "Title", "Body", 1)
+    result = await svc.check_duplicate("owner", "repo", "Sync job stalls after upgrade", "Body", 1)
 
     assert result.confidence == 0.0
     assert "keyword" in result.reasoning.lower() or "No keywords" in result.reasoning
-    gh.search_issues.assert_not_called()
+    # Only the exact-title probe ran; no keyword search.
+    assert gh.search_issues.call_count == 1
 
 
 @pytest.mark.asyncio
@@ -97,10 +203,10 @@ async def test_returns_no_match_when_keyword_generation_fails():
     extractor.generate_search_keywords = AsyncMock(side_effect=RuntimeError("LLM timeout"))
 
     svc = DuplicateService(gh, extractor)
-    result = await svc.check_duplicate("owner", "repo", "Title", "Body", 1)
+    result = await svc.check_duplicate("owner", "repo", "Sync job stalls after upgrade", "Body", 1)
 
     assert result.confidence == 0.0
-    gh.search_issues.assert_not_called()
+    assert gh.search_issues.call_count == 1
 
 
 @pytest.mark.asyncio
@@ -108,7 +214,7 @@ async def test_returns_no_match_when_search_returns_empty():
     gh, extractor = _make_services(candidates=[])
     svc = DuplicateService(gh, extractor)
 
-    result = await svc.check_duplicate("owner", "repo", "Title", "Body", 1)
+    result = await svc.check_duplicate("owner", "repo", "Sync job stalls after upgrade", "Body", 1)
 
     assert result.confidence == 0.0
     extractor.find_semantic_duplicate.assert_not_called()
@@ -120,7 +226,7 @@ async def test_returns_no_match_when_search_fails():
     gh.search_issues = AsyncMock(side_effect=Exception("API down"))
 
     svc = DuplicateService(gh, extractor)
-    result = await svc.check_duplicate("owner", "repo", "Title", "Body", 1)
+    result = await svc.check_duplicate("owner", "repo", "Sync job stalls after upgrade", "Body", 1)
 
     assert result.confidence == 0.0
 
@@ -131,7 +237,7 @@ async def test_returns_no_match_when_verification_fails():
     extractor.find_semantic_duplicate = AsyncMock(side_effect=Exception("LLM crash"))
 
     svc = DuplicateService(gh, extractor)
-    result = await svc.check_duplicate("owner", "repo", "Title", "Body", 1)
+    result = await svc.check_duplicate("owner", "repo", "Sync job stalls after upgrade", "Body", 1)
 
     assert result.confidence == 0.0
 
@@ -145,6 +251,6 @@ async def test_matched_state_is_enriched_from_candidate():
     gh, extractor = _make_services(candidates=candidates, dup_result=raw_result)
 
     svc = DuplicateService(gh, extractor)
-    result = await svc.check_duplicate("owner", "repo", "Title", "Body", 1)
+    result = await svc.check_duplicate("owner", "repo", "Sync job stalls after upgrade", "Body", 1)
 
     assert result.matched_issue_state == "open"
@@ -1,14 +1,15 @@
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.services.cache import CacheManager
 from app.services.extractor import ExtractorService
 
 
-def _mock_response(text: str) -> MagicMock:
-    resp = MagicMock()
-    resp.text = text
-    return resp
+def _mock_response(text: str) -> SimpleNamespace:
+    # Only .text is read; a plain namespace is enough.
+    return SimpleNamespace(text=text)
 
 
 VALID_JSON = """{
@@ -44,22 +45,20 @@ EASY_JSON = """{
 }"""
 
 
-def _patch_client(side_effect=None, return_value=None):
-    """Patch google.genai.Client used inside ExtractorService."""
-    mock_client = MagicMock()
-    if side_effect:
-        mock_client.aio.models.generate_content = AsyncMock(side_effect=side_effect)
-    else:
-        mock_client.aio.models.generate_content = AsyncMock(return_value=return_value)
-    return patch("app.services.extractor.genai.Client", return_value=mock_client), mock_client
+@pytest.fixture
+def mock_client(monkeypatch):
+    """Stand-in for the google.genai.Client built inside ExtractorService."""
+    client = MagicMock()
+    client.aio.models.generate_content = AsyncMock()
+    monkeypatch.setattr("app.services.extractor.genai.Client", lambda **_: client)
+    return client
 
 
 @pytest.mark.asyncio
-async def test_extract_happy_path():
-    patcher, mock_client = _patch_client(return_value=_mock_response(VALID_JSON))
-    with patcher:
-        svc = ExtractorService(use_cache=False)
-        metadata = await svc.extract("Some issue text")
+async def test_extract_happy_path(mock_client):
+    mock_client.aio.models.generate_content.return_value = _mock_response(VALID_JSON)
+    svc = ExtractorService(use_cache=False)
+    metadata = await svc.extract("Some issue text")
 
     assert metadata.is_crash is True
     assert metadata.difficulty == "medium"
@@ -68,37 +67,59 @@ async def test_extract_happy_path():
 
 
 @pytest.mark.asyncio
-async def test_extract_strips_markdown_fences():
+async def test_extract_accepts_text_parts(mock_client):
+    mock_client.aio.models.generate_content.return_value = _mock_response(VALID_JSON)
+    svc = ExtractorService(use_cache=False)
+    await svc.extract(["Title", "Body", "first comment"])
+
+    prompt = mock_client.aio.models.generate_content.call_args.kwargs["contents"]
+    assert "Title\nBody\nfirst comment" in prompt
+    config = mock_client.aio.models.generate_content.call_args.kwargs["config"]
+    assert config.response_mime_type == "application/json"
+
+
+@pytest.mark.asyncio
+async def test_extract_caches_text_parts(tmp_path, mock_client):
+    mock_client.aio.models.generate_content.return_value = _mock_response(VALID_JSON)
+    with patch("app.services.extractor.CacheManager",
+               lambda: CacheManager(cache_path=str(tmp_path / "c.db"))):
+        svc = ExtractorService(use_cache=True)
+        first = await svc.extract(["Title", "Body", "first comment"])
+        second = await svc.extract(["Title", "Body", "first comment"])
+
+    assert second == first
+    assert mock_client.aio.models.generate_content.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_extract_strips_markdown_fences(mock_client):
     fenced = f"```json\n{VALID_JSON}\n```"
-    patcher, _ = _patch_client(return_value=_mock_response(fenced))
-    with patcher:
-        svc = ExtractorService(use_cache=False)
-        metadata = await svc.extract("Issue text")
+    mock_client.aio.models.generate_content.return_value = _mock_response(fenced)
+    svc = ExtractorService(use_cache=False)
+    metadata = await svc.extract("Issue text")
 
     assert metadata.extraction_confidence == 0.95
 
 
 @pytest.mark.asyncio
-async def test_extract_retries_on_bad_json():
-    patcher, mock_client = _patch_client(side_effect=[
+async def test_extract_retries_on_bad_json(mock_client):
+    mock_client.aio.models.generate_content.side_effect = [
         _mock_response("This is not json"),
         _mock_response(EASY_JSON),
-    ])
-    with patcher:
-        svc = ExtractorService(use_cache=False)
-        metadata = await svc.extract("Retry me")
+    ]
+    svc = ExtractorService(use_cache=False)
+    metadata = await svc.extract("Retry me")
 
     assert metadata.primary_area == "documentation"
     assert mock_client.aio.models.generate_content.call_count == 2
 
 
 @pytest.mark.asyncio
-async def test_extract_falls_back_after_two_failures():
+async def test_extract_falls_back_after_two_failures(mock_client):
     """After both LLM attempts fail, fall back to deterministic regex extractor."""
-    patcher, mock_client = _patch_client(return_value=_mock_response("not json"))
-    with patcher:
-        svc = ExtractorService(use_cache=False)
-        result = await svc.extract("App crashed with segfault on startup")
+    mock_client.aio.models.generate_content.return_value = _mock_response("not json")
+    svc = ExtractorService(use_cache=False)
+    result = await svc.extract("App crashed with segfault on startup")
 
     assert result.extraction_mode == "fallback"
     assert result.extraction_confidence == 0.5
@@ -107,43 +128,194 @@ async def test_extract_falls_back_after_two_failures():
 
 
 @pytest.mark.asyncio
-async def test_extract_falls_back_on_empty_response():
-    patcher, _ = _patch_client(return_value=_mock_response(""))
-    with patcher:
-        svc = ExtractorService(use_cache=False)
-        result = await svc.extract("Some text")
+async def test_extract_falls_back_on_empty_response(mock_client):
+    mock_client.aio.models.generate_content.return_value = _mock_response("")
+    svc = ExtractorService(use_cache=False)
+    result = await svc.extract("Some text")
     assert result.extraction_mode == "fallback"
 
 
 @pytest.mark.asyncio
-async def test_circuit_open_uses_fallback_immediately():
+async def test_circuit_open_uses_fallback_immediately(mock_client):
     """When breaker is pre-tripped, no LLM call happens."""
-    patcher, mock_client = _patch_client(return_value=_mock_response(VALID_JSON))
-    with patcher:
-        svc = ExtractorService(use_cache=False)
-        # Manually trip the breaker.
-        svc.breaker._state = svc.breaker.state.__class__("open")
-        import time as _t
-        svc.breaker._opened_at = _t.monotonic()
-        svc.breaker._failures = 99
-
-        result = await svc.extract("Anything")
+    mock_client.aio.models.generate_content.return_value = _mock_response(VALID_JSON)
+    svc = ExtractorService(use_cache=False)
+    # Manually trip the breaker.
+    svc.breaker._state = svc.breaker.state.__class__("open")
+    import time as _t
+    svc.breaker._opened_at = _t.monotonic()
+    svc.breaker._failures = 99
+
+    result = await svc.extract("Anything")
     assert result.extraction_mode == "fallback"
     assert mock_client.aio.models.generate_content.call_count == 0
 
 
 @pytest.mark.asyncio
-async def test_cache_hit_skips_llm():
+async def test_cache_hit_skips_llm(mock_client):
     """Same text twice → LLM called only once."""
-    patcher, mock_client = _patch_client(return_value=_mock_response(VALID_JSON))
-    with patcher:
-        with patch("app.services.extractor.CacheManager") as MockCache:
-            cache_instance = MockCache.return_value
-            cache_instance.get.side_effect = [None, MagicMock()]
-            cache_instance.save = MagicMock()
+    mock_client.aio.models.generate_content.return_value = _mock_response(VALID_JSON)
+    with patch("app.services.extractor.CacheManager") as MockCache:
+        cache_instance = MockCache.return_value
+        cache_instance.get.side_effect = [None, MagicMock()]
+
+        svc = ExtractorService(use_cache=True)
+        await svc.extract("Some issue text")
+        await svc.extract("Some issue text")
+
+    assert mock_client.aio.models.generate_content.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_keywords_and_dupe_verdict_are_cached(tmp_path, mock_client):
+    dupe_json = '{"duplicate_number": 5, "confidence": 0.9, "reasoning": "same"}'
+    mock_client.aio.models.generate_content.side_effect = [
+        _mock_response("deadlock EPIPE"),
+        _mock_response(dupe_json),
+    ]
+    candidates = [{"number": 5, "title": "t", "state": "open", "body_snippet": "b"}]
+    with patch("app.services.extractor.CacheManager",
+               lambda: CacheManager(cache_path=str(tmp_path / "c.db"))):
+        svc = ExtractorService(use_cache=True)
+        for _ in range(2):
+            assert await svc.generate_search_keywords("issue") == "deadlock EPIPE"
+            result = await svc.find_semantic_duplicate("issue", candidates)
+            assert result.duplicate_number == 5
+
+    assert mock_client.aio.models.generate_content.call_count == 2
+
+
+def test_fast_path_classifies_docs_titles_without_llm(mock_client):
+    svc = ExtractorService(use_cache=False)
+    meta = svc.fast_path("docs(api): fix typo in README", "")
+
+    assert meta is not None
+    assert meta.extraction_mode == "heuristic"
+    assert meta.difficulty == "easy"
+    assert meta.primary_area == "documentation"
+    assert meta.extraction_confidence == 0.6
+    mock_client.aio.models.generate_content.assert_not_called()
+
+
+def test_fast_path_defers_to_llm(mock_client):
+    svc = ExtractorService(use_cache=False)
+    assert svc.fast_path("Login page crashes on submit", "") is None
+    assert svc.fast_path("chore: app crashed with segfault", "") is None
+
+
+@pytest.mark.asyncio
+async def test_extract_batch_uses_one_call_and_caches(tmp_path, mock_client):
+    mock_client.aio.models.generate_content.side_effect = [
+        _mock_response(f"[{VALID_JSON}, {EASY_JSON}]"),
+        _mock_response(VALID_JSON),
+    ]
+    with patch("app.services.extractor.CacheManager",
+               lambda: CacheManager(cache_path=str(tmp_path / "c.db"))):
+        svc = ExtractorService(use_cache=True)
+        first = await svc.extract_batch(["crash issue", ("docs", "outdated")])
+        again = await svc.extract_batch(["crash issue", ("docs", "outdated")])
+        # Batched results saw truncated text; a single extraction re-reads it in full.
+        single = await svc.extract(("docs", "outdated"))
+        rebatched = await svc.extract_batch([("docs", "outdated")])
+
+    assert [m.difficulty for m in first] == ["medium", "easy"]
+    assert [m.difficulty for m in again] == ["medium", "easy"]
+    assert single.difficulty == "medium"
+    # The full extraction now takes precedence over the batched one.
+    assert rebatched[0].difficulty == "medium"
+    assert mock_client.aio.models.generate_content.call_count == 2
+    prompt = mock_client.aio.models.generate_content.call_args_list[0].kwargs["contents"]
+    assert "[[ISSUE 2]]\ndocs\noutdated" in prompt
+
+
+@pytest.mark.asyncio
+async def test_extract_batch_falls_back_on_length_mismatch(mock_client):
+    mock_client.aio.models.generate_content.side_effect = [
+        _mock_response(f"[{VALID_JSON}]"),
+        _mock_response(VALID_JSON),
+        _mock_response(EASY_JSON),
+    ]
+    svc = ExtractorService(use_cache=False)
+    results = await svc.extract_batch(["one", "two"])
+
+    assert [m.difficulty for m in results] == ["medium", "easy"]
+    assert mock_client.aio.models.generate_content.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_extract_many_bounds_concurrency(mock_client):
+    import asyncio
+
+    in_flight = peak = 0
+
+    async def slow_response(**_):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _mock_response(VALID_JSON)
 
-            svc = ExtractorService(use_cache=True)
-            await svc.extract("Some issue text")
-            await svc.extract("Some issue text")
+    mock_client.aio.models.generate_content.side_effect = slow_response
+    svc = ExtractorService(use_cache=False)
+    results = await svc.extract_many([f"issue {n}" for n in range(6)], concurrency=2)
 
+    assert len(results) == 6
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_extract_offline_polls_batch_job_and_retries_failures(mock_client):
+    from google.genai import types
+
+    def inlined(text=None, error=None):
+        return types.InlinedResponse(
+            response=types.GenerateContentResponse(
+                candidates=[types.Candidate(content=types.Content(parts=[types.Part(text=text)]))]
+            ) if text else None,
+            error=error,
+        )
+
+    running = types.BatchJob(name="batches/1", state=types.JobState.JOB_STATE_RUNNING)
+    done = types.BatchJob(
+        name="batches/1",
+        state=types.JobState.JOB_STATE_SUCCEEDED,
+        dest=types.BatchJobDestination(inlined_responses=[
+            inlined(VALID_JSON),
+            inlined(error=types.JobError(code=500, message="boom")),
+        ]),
+    )
+    mock_client.aio.models.generate_content.return_value = _mock_response(EASY_JSON)
+    mock_client.aio.batches.create = AsyncMock(return_value=running)
+    mock_client.aio.batches.get = AsyncMock(return_value=done)
+    svc = ExtractorService(use_cache=False)
+    results = await svc.extract_offline(["crash issue", ("docs", "outdated")], poll_interval=0)
+
+    assert [m.difficulty for m in results] == ["medium", "easy"]
+    assert len(mock_client.aio.batches.create.call_args.kwargs["src"]) == 2
+    mock_client.aio.batches.get.assert_awaited_once_with(name="batches/1")
+    # Only the errored request goes back through the synchronous API.
     assert mock_client.aio.models.generate_content.call_count == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("get_effect,error", [
+    (None, TimeoutError),  # job never leaves RUNNING
+    (RuntimeError("503 from batches.get"), RuntimeError),
+])
+async def test_extract_offline_cancels_job_on_timeout_or_poll_error(mock_client, get_effect, error):
+    from google.genai import types
+
+    running = types.BatchJob(name="batches/1", state=types.JobState.JOB_STATE_RUNNING)
+    mock_client.aio.batches.create = AsyncMock(return_value=running)
+    mock_client.aio.batches.get = AsyncMock(return_value=running, side_effect=get_effect)
+    mock_client.aio.batches.cancel = AsyncMock()
+    polls = []
+    svc = ExtractorService(use_cache=False)
+
+    with pytest.raises(error):
+        await svc.extract_offline(["issue"], poll_interval=0.01, timeout=0.05, on_poll=polls.append)
+
+    mock_client.aio.batches.cancel.assert_awaited_once_with(name="batches/1")
+    assert polls and polls[0].startswith("Batch job batches/1:")
+    mock_client.aio.models.generate_content.assert_not_called()
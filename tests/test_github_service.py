@@ -1,3 +1,4 @@
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -25,12 +26,14 @@ def _make_response(status_code: int, body=None, headers: dict = {}):
     resp.headers = headers
     if isinstance(body, (dict, list)):
         resp.json.return_value = body
+        resp.content = json.dumps(body).encode()
         resp.text = str(body)
     else:
         resp.json.side_effect = ValueError("not json")
         resp.text = body or ""
+        resp.content = resp.text.encode()
     resp.raise_for_status = MagicMock()
-    if status_code >= 400:
+    if not 200 <= status_code < 300:  # like httpx, redirects and 304 included
         resp.raise_for_status.side_effect = Exception(f"HTTP {status_code}")
     return resp
 
@@ -152,6 +155,10 @@ async def test_search_issues_returns_candidates():
     assert len(results) == 2
     assert results[0]["number"] == 10
     assert results[1]["body_snippet"] == ""
+    assert mock_get.call_args.kwargs["params"] == {
+        "q": "repo:owner/repo is:issue sort:relevance auth crash null",
+        "per_page": 5,
+    }
 
 
 @pytest.mark.asyncio
@@ -172,6 +179,120 @@ async def test_search_issues_retries_on_rate_limit():
     assert mock_get.call_count == 2
 
 
+# ── fetch_issues (GraphQL with REST fallback) ────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_fetch_issues_uses_single_graphql_request():
+    node = {
+        "number": 3, "title": "Crash", "body": "b", "url": "u", "state": "OPEN",
+        "createdAt": "c", "updatedAt": "d", "author": {"login": "alice"},
+        "labels": {"nodes": [{"name": "bug"}]},
+        "reactionGroups": [{"content": "THUMBS_UP", "reactors": {"totalCount": 4}}],
+    }
+    resp = _make_response(200, {"data": {"repository": {"issues": {"nodes": [node]}}}})
+    mock_post = AsyncMock(return_value=resp)
+    mock_get = AsyncMock()
+    mock_client = _make_async_client(mock_get=mock_get, mock_post=mock_post)
+
+    with patch("app.services.github_service.httpx.AsyncClient", return_value=mock_client):
+        svc = GitHubService(github_token="fake-token")
+        issues = await svc.fetch_issues("owner", "repo", limit=5)
+
+    assert [i.number for i in issues] == [3]
+    assert issues[0].state == "open"
+    assert issues[0].labels == ["bug"]
+    assert issues[0].reactions == {"+1": 4}
+    assert mock_post.call_args.kwargs["json"]["variables"]["states"] == ["OPEN"]
+    mock_get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_fetch_issues_falls_back_to_rest_on_graphql_error():
+    gql_resp = _make_response(200, {"errors": [{"message": "boom"}]})
+    rest_resp = _make_response(200, {"items": [{"number": 8, "title": "t", "state": "open", "labels": []}]})
+    mock_client = _make_async_client(
+        mock_get=AsyncMock(return_value=rest_resp), mock_post=AsyncMock(return_value=gql_resp)
+    )
+
+    with patch("app.services.github_service.httpx.AsyncClient", return_value=mock_client):
+        svc = GitHubService(github_token="fake-token")
+        issues = await svc.fetch_issues("owner", "repo")
+
+    assert [i.number for i in issues] == [8]
+
+
+@pytest.mark.asyncio
+async def test_fetch_issues_without_token_uses_rest():
+    rest_resp = _make_response(200, {"items": []})
+    mock_post = AsyncMock()
+    mock_client = _make_async_client(mock_get=AsyncMock(return_value=rest_resp), mock_post=mock_post)
+
+    with patch("app.services.github_service.httpx.AsyncClient", return_value=mock_client):
+        svc = GitHubService()
+        assert await svc.fetch_issues("owner", "repo") == []
+
+    mock_post.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_search_issues_revalidates_with_etag():
+    payload = {"items": [{"number": 5, "title": "Test", "state": "open", "body": "b"}]}
+    fresh = _make_response(200, payload, {"ETag": 'W/"abc"'})
+    not_modified = _make_response(304, "")
+    mock_get = AsyncMock(side_effect=[fresh, not_modified])
+    mock_client = _make_async_client(mock_get=mock_get)
+
+    with patch("app.services.github_service.httpx.AsyncClient", return_value=mock_client):
+        svc = GitHubService(github_token="fake-token")
+        first = await svc.search_issues("owner", "repo", "crash")
+        second = await svc.search_issues("owner", "repo", "crash")
+
+    assert first == second
+    assert second[0]["number"] == 5
+    assert mock_get.call_args_list[0].kwargs["headers"] is None
+    assert mock_get.call_args_list[1].kwargs["headers"] == {"If-None-Match": 'W/"abc"'}
+
+
+@pytest.mark.asyncio
+async def test_fetch_issue_reuses_cached_issue_and_comments_on_304():
+    issue_payload = {"number": 42, "title": "Crash", "body": "b", "state": "open", "labels": []}
+    comments_payload = [{"body": "Confirmed."}]
+
+    def route(url, params=None, headers=None):
+        etag = 'W/"comments"' if url.endswith("/comments") else 'W/"issue"'
+        if headers:
+            assert headers == {"If-None-Match": etag}
+            return _make_response(304, "")
+        payload = comments_payload if url.endswith("/comments") else issue_payload
+        return _make_response(200, payload, {"ETag": etag})
+
+    mock_get = AsyncMock(side_effect=route)
+    mock_client = _make_async_client(mock_get=mock_get)
+
+    with patch("app.services.github_service.httpx.AsyncClient", return_value=mock_client):
+        svc = GitHubService(github_token="fake-token")
+        first = await svc.fetch_issue("owner", "repo", 42)
+        second = await svc.fetch_issue("owner", "repo", 42)
+
+    assert mock_get.call_count == 4
+    assert second == first
+    assert second.comments == ["Confirmed."]
+
+
+@pytest.mark.asyncio
+async def test_fetch_comments_reuses_cached_body_on_304():
+    fresh = _make_response(200, [{"body": "First!"}], {"ETag": 'W/"c"'})
+    not_modified = _make_response(304, "")
+    mock_get = AsyncMock(side_effect=[fresh, not_modified])
+    mock_client = _make_async_client(mock_get=mock_get)
+
+    with patch("app.services.github_service.httpx.AsyncClient", return_value=mock_client):
+        svc = GitHubService(github_token="fake-token")
+        client = svc._get_client()
+        assert await svc._fetch_comments(client, "owner", "repo", 1) == ["First!"]
+        assert await svc._fetch_comments(client, "owner", "repo", 1) == ["First!"]
+
+
 # ── post_comment ──────────────────────────────────────────────────────────────
 
 @pytest.mark.asyncio
@@ -187,6 +308,39 @@ async def test_post_comment_success():
     assert result is True
 
 
+# ── shared client ─────────────────────────────────────────────────────────────
+
+def test_client_is_reused_within_a_loop_and_replaced_across_loops():
+    import asyncio
+
+    svc = GitHubService()
+
+    async def grab():
+        return svc._get_client(), svc._get_client()
+
+    first, again = asyncio.run(grab())
+    assert first is again
+    second, _ = asyncio.run(grab())
+    assert second is not first
+    # The stale client is released, not kept alongside the new one.
+    assert svc._client is second
+    asyncio.run(svc.aclose())
+    assert svc._client is None
+
+
+def test_shared_client_carries_auth_headers():
+    import asyncio
+
+    svc = GitHubService(github_token="fake-token")
+    with patch("app.services.github_service.httpx.AsyncClient") as client_cls:
+        async def grab():
+            svc._get_client()
+
+        asyncio.run(grab())
+
+    assert client_cls.call_args.kwargs["headers"]["Authorization"] == "token fake-token"
+
+
 # ── parse_github_url ──────────────────────────────────────────────────────────
 
 def test_parse_github_url_valid():
@@ -202,6 +356,12 @@ def test_parse_github_url_strips_git_suffix():
     assert repo == "my-repo"
 
 
+def test_parse_github_url_accepts_ssh_and_trailing_slash():
+    svc = GitHubService()
+    assert svc.parse_github_url("git@github.com:acme/my-repo.git") == ("acme", "my-repo")
+    assert svc.parse_github_url("github.com/acme/my-repo/") == ("acme", "my-repo")
+
+
 def test_parse_github_url_invalid_raises():
     svc = GitHubService()
     with pytest.raises(ValueError):
@@ -1,4 +1,6 @@
-from app.services.logic import apply
+import pytest
+
+from app.services.logic import apply, compile_logic
 
 # ── basic operators ───────────────────────────────────────────────────────────
 
@@ -22,6 +24,9 @@ def test_comparison_operators():
 def test_and_short_circuits():
     assert apply({"and": [True, True]}, {}) is True
     assert apply({"and": [True, False]}, {}) is False
+    # The second operand would raise if it were evaluated.
+    assert apply({"and": [False, {"==": [1]}]}, {}) is False
+    assert apply({"or": [True, {"==": [1]}]}, {}) is True
 
 
 def test_or():
@@ -106,3 +111,34 @@ def test_literal_passthrough():
     assert apply(42, {}) == 42
     assert apply("hello", {}) == "hello"
     assert apply(True, {}) is True
+
+
+# ── compile_logic parity ──────────────────────────────────────────────────────
+
+_PARITY_CASES = [
+    ({"==": [{"var": "x"}, 5]}, {"x": 5}),
+    ({"!=": [{"var": "x"}, 5]}, {"x": 5}),
+    ({">=": [{"var": "n"}, 3]}, {"n": 2}),
+    ({"and": [{"==": [{"var": "a"}, True]}, {"<": [{"var": "b"}, 1]}]}, {"a": True, "b": 0}),
+    ({"or": [{"==": [{"var": "a"}, 1]}, {"==": [{"var": "a"}, 2]}]}, {"a": 2}),
+    ({"in": ["waiting-for-info", {"var": "labels"}]}, {"labels": ["waiting-for-info"]}),
+    ({"in": ["x", 42]}, {}),
+    ({"!": {"var": "flag"}}, {"flag": False}),
+    ({"var": "issue.state"}, {"issue": {"state": "open"}}),
+    ({"var": ["missing_key", "default"]}, {}),
+    ({"var": ["issue.state", "none"]}, {"issue": "open"}),
+    ({"var": "x"}, ["not", "a", "dict"]),
+    ({"var": ""}, {"x": 1}),
+    ({"unknown_op": [1, 2]}, {}),
+    (42, {}),
+]
+
+
+@pytest.mark.parametrize("rule,data", _PARITY_CASES)
+def test_compile_logic_matches_apply(rule, data):
+    assert compile_logic(rule)(data) == apply(rule, data)
+
+
+def test_compile_logic_rejects_malformed_binary_op():
+    with pytest.raises(IndexError):
+        compile_logic({"==": [1]})
@@ -1,3 +1,5 @@
+import pytest
+
 from app.models.schemas import IssueMetadata
 from app.services.reporter import BoardItem, Reporter
 
@@ -51,3 +53,33 @@ def test_generate_feed_writes_xml(tmp_path):
     contents = out.read_text()
     assert "Fix typo in README" in contents
     assert path.endswith("feed.xml")
+
+
+def test_generate_board_can_also_write_gzip(tmp_path):
+    import gzip
+
+    out = tmp_path / "board.html"
+    Reporter().generate_board(_items(), output_path=str(out), compress=True)
+    with gzip.open(str(out) + ".gz", "rt", encoding="utf-8") as f:
+        assert f.read() == out.read_text(encoding="utf-8")
+
+
+class _Exploding:
+    def __getattr__(self, name):
+        raise RuntimeError("render failed")
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_failed_render_keeps_previous_files(tmp_path, compress):
+    out = tmp_path / "board.html"
+    gz = tmp_path / "board.html.gz"
+    out.write_text("previous board")
+    gz.write_bytes(b"previous gzip")
+    broken = _items() + [BoardItem(1, "t", "u", "2026-01-01T00:00:00Z", metadata=_Exploding())]
+
+    with pytest.raises(RuntimeError):
+        Reporter().generate_board(broken, output_path=str(out), compress=compress)
+
+    assert out.read_text() == "previous board"
+    assert gz.read_bytes() == b"previous gzip"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["board.html", "board.html.gz"]
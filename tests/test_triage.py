@@ -1,47 +1,34 @@
+import pytest
+
 from app.models.schemas import IssueMetadata
 from app.services.triage import TriageService
 
 
-def test_critical_crash_rule(crash_metadata):
-    svc = TriageService(rules_path="rules.yaml")
-    action = svc.evaluate(crash_metadata)
-
-    assert action.priority_score == 5
-    assert "critical" in action.labels
-
+@pytest.mark.parametrize("meta_fixture,priority,label", [
+    ("crash_metadata", 5, "critical"),
+    ("easy_doc_metadata", 1, "good-first-issue"),
+    ("feature_metadata", 2, "help-wanted"),
+])
+def test_rule(request, triage_service, meta_fixture, priority, label):
+    action = triage_service.evaluate(request.getfixturevalue(meta_fixture))
 
-def test_good_first_issue_rule():
-    easy_issue = IssueMetadata(
-        has_reproduction_steps=False,
-        has_stacktrace=False,
-        has_logs=False,
-        operating_system=None,
-        environment="unknown",
-        is_crash=False,
-        is_security_issue=False,
-        is_blocker=False,
-        summary="Fix typo in README",
-        difficulty="easy",
-        required_skills=["markdown"],
-        primary_area="documentation",
-        extraction_confidence=0.95,
-    )
-    svc = TriageService(rules_path="rules.yaml")
-    action = svc.evaluate(easy_issue)
+    assert action.priority_score == priority
+    assert label in action.labels
 
-    assert action.priority_score == 1
-    assert "good-first-issue" in action.labels
 
+def test_evaluate_batch_matches_evaluate(
+    triage_service, crash_metadata, easy_doc_metadata, feature_metadata, empty_metadata
+):
+    batch = [crash_metadata, easy_doc_metadata, feature_metadata, empty_metadata]
 
-def test_help_wanted_rule(feature_metadata):
-    svc = TriageService(rules_path="rules.yaml")
-    action = svc.evaluate(feature_metadata)
+    actions = triage_service.evaluate_batch(batch)
 
-    assert action.priority_score == 2
-    assert "help-wanted" in action.labels
+    assert actions == [triage_service.evaluate(m) for m in batch]
+    assert [a.priority_score for a in actions] == [5, 1, 2, 3]
+    assert "triage/low-confidence" in actions[3].labels
 
 
-def test_confidence_gate_blocks_auto_labeling():
+def test_confidence_gate_blocks_auto_labeling(triage_service):
     """Low-confidence extraction must not apply domain labels."""
     low_conf = IssueMetadata(
         has_reproduction_steps=False,
@@ -58,14 +45,13 @@ def test_confidence_gate_blocks_auto_labeling():
         primary_area="unknown",
         extraction_confidence=0.4,  # below 0.75 threshold
     )
-    svc = TriageService(rules_path="rules.yaml")
-    action = svc.evaluate(low_conf, min_confidence=0.75)
+    action = triage_service.evaluate(low_conf, min_confidence=0.75)
 
     assert "triage/low-confidence" in action.labels
     assert "critical" not in action.labels
 
 
-def test_confidence_gate_bypassed_with_lower_threshold():
+def test_confidence_gate_bypassed_with_lower_threshold(triage_service):
     """Setting a lower threshold allows the rules engine to run."""
     low_conf = IssueMetadata(
         has_reproduction_steps=True,
@@ -82,32 +68,29 @@ def test_confidence_gate_bypassed_with_lower_threshold():
         primary_area="backend",
         extraction_confidence=0.5,
     )
-    svc = TriageService(rules_path="rules.yaml")
-    action = svc.evaluate(low_conf, min_confidence=0.3)
+    action = triage_service.evaluate(low_conf, min_confidence=0.3)
 
     assert action.priority_score == 5
     assert "critical" in action.labels
 
 
-def test_default_fallback_no_rules_match(empty_metadata):
-    svc = TriageService(rules_path="rules.yaml")
+def test_default_fallback_no_rules_match(empty_metadata, triage_service):
     # empty_metadata has confidence 0.2 — use min_confidence=0.0 to test fallback path
-    action = svc.evaluate(empty_metadata, min_confidence=0.0)
+    action = triage_service.evaluate(empty_metadata, min_confidence=0.0)
 
     assert action.priority_score == 3
     assert action.priority_score == 3
 
 
-def test_trace_returns_full_decision_record(crash_metadata):
-    svc = TriageService(rules_path="rules.yaml")
-    results = svc.trace(crash_metadata)
+def test_trace_returns_full_decision_record(crash_metadata, triage_service):
+    results = triage_service.trace(crash_metadata)
     assert len(results) >= 1
     matched_results = [r for r in results if r.matched]
     assert len(matched_results) >= 1
     assert matched_results[0].action is not None
 
 
-def test_trace_low_confidence_short_circuits():
+def test_trace_low_confidence_short_circuits(triage_service):
     low_conf = IssueMetadata(
         has_reproduction_steps=False,
         has_stacktrace=False,
@@ -123,16 +106,18 @@ def test_trace_low_confidence_short_circuits():
         primary_area="unknown",
         extraction_confidence=0.2,
     )
-    svc = TriageService(rules_path="rules.yaml")
-    results = svc.trace(low_conf)
+    results = triage_service.trace(low_conf)
     assert len(results) == 1
     assert results[0].rule_name == "confidence-gate"
     assert results[0].matched is True
 
 
-def test_missing_rules_file_falls_back_to_default(tmp_path):
-    missing = tmp_path / "does_not_exist.yaml"
-    svc = TriageService(rules_path=str(missing))
+@pytest.mark.parametrize("contents", [None, "this is: not [valid: yaml"], ids=["missing", "invalid"])
+def test_unusable_rules_file_falls_back_to_default(tmp_path, contents):
+    path = tmp_path / "rules.yaml"
+    if contents is not None:
+        path.write_text(contents)
+    svc = TriageService(rules_path=str(path))
     # Falls back to root rules.yaml — should still load rules
     assert len(svc.rules) > 0
 
@@ -143,16 +128,29 @@ def test_missing_default_rules_yields_empty(tmp_path, monkeypatch):
     assert svc.rules == []
 
 
-def test_invalid_yaml_falls_back_gracefully(tmp_path):
-    bad = tmp_path / "bad.yaml"
-    bad.write_text("this is: not [valid: yaml")
-    svc = TriageService(rules_path=str(bad))
-    # Falls back to project rules.yaml
-    assert isinstance(svc.rules, list)
-
-
-def test_evaluate_context_overrides_metadata(crash_metadata):
-    svc = TriageService(rules_path="rules.yaml")
+def test_evaluate_context_overrides_metadata(crash_metadata, triage_service):
     # Add context — should merge into evaluation data without crashing
-    action = svc.evaluate(crash_metadata, context={"days_since_update": 5})
+    action = triage_service.evaluate(crash_metadata, context={"days_since_update": 5})
     assert action.priority_score == 5
+
+
+def test_context_does_not_leak_into_metadata(feature_metadata, triage_service):
+    action = triage_service.evaluate(feature_metadata, context={"difficulty": "easy"})
+
+    assert "good-first-issue" in action.labels
+    assert feature_metadata.difficulty == "medium"
+
+
+def test_malformed_rule_is_skipped_at_evaluation(tmp_path, feature_metadata):
+    rules = tmp_path / "rules.yaml"
+    rules.write_text(
+        "- name: broken\n"
+        "  condition: {'==': [1]}\n"
+        "  action: {priority_score: 5, labels: [bad], reasoning: never}\n"
+        "- name: medium\n"
+        "  condition: {'==': [{var: difficulty}, medium]}\n"
+        "  action: {priority_score: 2, labels: [help-wanted], reasoning: ok}\n"
+    )
+    svc = TriageService(rules_path=str(rules))
+    action = svc.evaluate(feature_metadata)
+    assert action.labels == ["help-wanted"]